@@ -18,6 +18,16 @@ from transactions.models import Transaction
 from token_auth.models import ApiToken
 
 
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    """Cache in memory, which the single test process shares, and clear it around each test"""
+    from django.core.cache import cache
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def sample_transaction_data():
     """Sample transaction data for testing"""
@@ -90,7 +100,7 @@ def multiple_transactions(db):
     return Transaction.objects.bulk_create(transactions)
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def valid_csv_content():
     """Valid CSV content for testing uploads"""
     return """transaction_id,timestamp,amount,currency,customer_id,product_id,quantity
@@ -98,7 +108,7 @@ f47ac10b-58cc-4372-a567-0e02b2c3d479,2024-01-15T10:30:00Z,99.99,PLN,550e8400-e29
 f47ac10b-58cc-4372-a567-0e02b2c3d480,2024-01-15T14:22:15Z,149.50,EUR,550e8400-e29b-41d4-a716-446655440002,6ba7b810-9dad-11d1-80b4-00c04fd430c9,1"""
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def invalid_csv_content():
     """Invalid CSV content for testing error handling"""
     return """transaction_id,timestamp,amount,currency,customer_id,product_id,quantity
@@ -150,45 +160,20 @@ def api_token(db):
 @pytest.fixture
 def authenticated_api_client(api_token):
     """API client with authentication token"""
+    from urllib.parse import urlencode
     from rest_framework.test import APIClient
-    
+
     class AuthenticatedAPIClient(APIClient):
+        """Appends the token query parameter that ApiTokenAuthentication expects to every request"""
+
         def __init__(self, token, *args, **kwargs):
             super().__init__(*args, **kwargs)
             self.token = token
-            
-        def get(self, path, data=None, **extra):
-            if data is None:
-                data = {}
-            data['token'] = self.token
-            return super().get(path, data, **extra)
-            
-        def post(self, path, data=None, **extra):
-            if '?' in path:
-                path += f'&token={self.token}'
-            else:
-                path += f'?token={self.token}'
-            return super().post(path, data, **extra)
-            
-        def put(self, path, data=None, **extra):
-            if '?' in path:
-                path += f'&token={self.token}'
-            else:
-                path += f'?token={self.token}'
-            return super().put(path, data, **extra)
-            
-        def patch(self, path, data=None, **extra):
-            if '?' in path:
-                path += f'&token={self.token}'
-            else:
-                path += f'?token={self.token}'
-            return super().patch(path, data, **extra)
-            
-        def delete(self, path, data=None, **extra):
-            if '?' in path:
-                path += f'&token={self.token}'
-            else:
-                path += f'?token={self.token}'
-            return super().delete(path, data, **extra)
-    
-    return AuthenticatedAPIClient(api_token.token)
\ No newline at end of file
+            self.token_query = urlencode({'token': token})
+
+        def request(self, **kwargs):
+            query_string = kwargs.get('QUERY_STRING')
+            kwargs['QUERY_STRING'] = f"{query_string}&{self.token_query}" if query_string else self.token_query
+            return super().request(**kwargs)
+
+    return AuthenticatedAPIClient(api_token.token)
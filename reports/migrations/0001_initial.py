@@ -0,0 +1,95 @@
+# Generated by Django 5.2.2 on 2026-10-14 17:01
+
+from django.db import migrations, models
+
+CUSTOMER_SUMMARY_MV_SQL = """
+    CREATE MATERIALIZED VIEW customer_summary_mv AS
+    SELECT t.customer_id,
+           t.currency,
+           SUM(t.amount) AS amount_sum,
+           COUNT(*) AS transaction_count,
+           MAX(t.timestamp) AS last_timestamp,
+           c.product_count
+    FROM transactions t
+    JOIN (
+        SELECT customer_id, COUNT(DISTINCT product_id) AS product_count
+        FROM transactions
+        GROUP BY customer_id
+    ) c ON c.customer_id = t.customer_id
+    GROUP BY t.customer_id, t.currency, c.product_count;
+
+    CREATE UNIQUE INDEX customer_summary_mv_pk ON customer_summary_mv (customer_id, currency);
+"""
+
+PRODUCT_SUMMARY_MV_SQL = """
+    CREATE MATERIALIZED VIEW product_summary_mv AS
+    SELECT t.product_id,
+           t.currency,
+           SUM(t.amount * t.quantity) AS revenue_sum,
+           SUM(t.quantity) AS quantity_sum,
+           COUNT(*) AS transaction_count,
+           p.customer_count
+    FROM transactions t
+    JOIN (
+        SELECT product_id, COUNT(DISTINCT customer_id) AS customer_count
+        FROM transactions
+        GROUP BY product_id
+    ) p ON p.product_id = t.product_id
+    GROUP BY t.product_id, t.currency, p.customer_count;
+
+    CREATE UNIQUE INDEX product_summary_mv_pk ON product_summary_mv (product_id, currency);
+"""
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('transactions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerSummaryMV',
+            fields=[
+                ('pk', models.CompositePrimaryKey('customer_id', 'currency', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('customer_id', models.UUIDField()),
+                ('currency', models.CharField(max_length=3)),
+                ('amount_sum', models.DecimalField(decimal_places=2, max_digits=20)),
+                ('transaction_count', models.BigIntegerField()),
+                ('last_timestamp', models.DateTimeField()),
+                ('product_count', models.BigIntegerField()),
+            ],
+            options={
+                'db_table': 'customer_summary_mv',
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductSummaryMV',
+            fields=[
+                ('pk', models.CompositePrimaryKey('product_id', 'currency', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('product_id', models.UUIDField()),
+                ('currency', models.CharField(max_length=3)),
+                ('revenue_sum', models.DecimalField(decimal_places=2, max_digits=20)),
+                ('quantity_sum', models.BigIntegerField()),
+                ('transaction_count', models.BigIntegerField()),
+                ('customer_count', models.BigIntegerField()),
+            ],
+            options={
+                'db_table': 'product_summary_mv',
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(
+            sql=CUSTOMER_SUMMARY_MV_SQL,
+            reverse_sql='DROP MATERIALIZED VIEW IF EXISTS customer_summary_mv;',
+        ),
+        migrations.RunSQL(
+            sql=PRODUCT_SUMMARY_MV_SQL,
+            reverse_sql='DROP MATERIALIZED VIEW IF EXISTS product_summary_mv;',
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.2 on 2026-10-14 17:30
+
+import importlib
+
+from django.db import migrations
+
+initial = importlib.import_module('reports.migrations.0001_initial')
+
+# Same views as 0001_initial, summing integer cents and converting once per group
+CUSTOMER_SUMMARY_MV_SQL = """
+    DROP MATERIALIZED VIEW IF EXISTS customer_summary_mv;
+
+    CREATE MATERIALIZED VIEW customer_summary_mv AS
+    SELECT t.customer_id,
+           t.currency,
+           (SUM(t.amount_cents) / 100)::numeric(20, 2) AS amount_sum,
+           COUNT(*) AS transaction_count,
+           MAX(t.timestamp) AS last_timestamp,
+           c.product_count
+    FROM transactions t
+    JOIN (
+        SELECT customer_id, COUNT(DISTINCT product_id) AS product_count
+        FROM transactions
+        GROUP BY customer_id
+    ) c ON c.customer_id = t.customer_id
+    GROUP BY t.customer_id, t.currency, c.product_count;
+
+    CREATE UNIQUE INDEX customer_summary_mv_pk ON customer_summary_mv (customer_id, currency);
+"""
+
+PRODUCT_SUMMARY_MV_SQL = """
+    DROP MATERIALIZED VIEW IF EXISTS product_summary_mv;
+
+    CREATE MATERIALIZED VIEW product_summary_mv AS
+    SELECT t.product_id,
+           t.currency,
+           (SUM(t.amount_cents * t.quantity) / 100)::numeric(20, 2) AS revenue_sum,
+           SUM(t.quantity) AS quantity_sum,
+           COUNT(*) AS transaction_count,
+           p.customer_count
+    FROM transactions t
+    JOIN (
+        SELECT product_id, COUNT(DISTINCT customer_id) AS customer_count
+        FROM transactions
+        GROUP BY product_id
+    ) p ON p.product_id = t.product_id
+    GROUP BY t.product_id, t.currency, p.customer_count;
+
+    CREATE UNIQUE INDEX product_summary_mv_pk ON product_summary_mv (product_id, currency);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+        ('transactions', '0005_amount_cents'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=CUSTOMER_SUMMARY_MV_SQL,
+            reverse_sql='DROP MATERIALIZED VIEW IF EXISTS customer_summary_mv;' + initial.CUSTOMER_SUMMARY_MV_SQL,
+        ),
+        migrations.RunSQL(
+            sql=PRODUCT_SUMMARY_MV_SQL,
+            reverse_sql='DROP MATERIALIZED VIEW IF EXISTS product_summary_mv;' + initial.PRODUCT_SUMMARY_MV_SQL,
+        ),
+    ]
@@ -1,3 +1,55 @@
-from django.db import models
+from django.db import connection, models
 
-# Create your models here.
+
+class MaterializedViewModel(models.Model):
+    """
+    Base class for read-only models backed by a PostgreSQL materialized view.
+    The views are created by migrations; Django never manages their schema.
+    """
+
+    class Meta:
+        abstract = True
+        managed = False
+
+    @classmethod
+    def refresh(cls, concurrently: bool = True) -> None:
+        """Recompute the materialized view from the transactions table"""
+        option = ' CONCURRENTLY' if concurrently else ''
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'REFRESH MATERIALIZED VIEW{option} {connection.ops.quote_name(cls._meta.db_table)}'
+            )
+
+
+class CustomerSummaryMV(MaterializedViewModel):
+    """
+    Precomputed customer totals, one row per (customer_id, currency).
+    product_count is counted across all currencies of the customer.
+    """
+    pk = models.CompositePrimaryKey('customer_id', 'currency')
+    customer_id = models.UUIDField()
+    currency = models.CharField(max_length=3)
+    amount_sum = models.DecimalField(max_digits=20, decimal_places=2)
+    transaction_count = models.BigIntegerField()
+    last_timestamp = models.DateTimeField()
+    product_count = models.BigIntegerField()
+
+    class Meta(MaterializedViewModel.Meta):
+        db_table = 'customer_summary_mv'
+
+
+class ProductSummaryMV(MaterializedViewModel):
+    """
+    Precomputed product totals, one row per (product_id, currency).
+    customer_count is counted across all currencies of the product.
+    """
+    pk = models.CompositePrimaryKey('product_id', 'currency')
+    product_id = models.UUIDField()
+    currency = models.CharField(max_length=3)
+    revenue_sum = models.DecimalField(max_digits=20, decimal_places=2)
+    quantity_sum = models.BigIntegerField()
+    transaction_count = models.BigIntegerField()
+    customer_count = models.BigIntegerField()
+
+    class Meta(MaterializedViewModel.Meta):
+        db_table = 'product_summary_mv'
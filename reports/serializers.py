@@ -1,5 +1,34 @@
 from rest_framework import serializers
 
+# Largest number of rows a top-N report may return
+REPORT_LIMIT_MAX = 100
+
+
+class ReportDateRangeSerializer(serializers.Serializer):
+    """Validates the optional start_date/end_date report query parameters"""
+    start_date = serializers.DateField(
+        required=False,
+        error_messages={'invalid': 'Invalid start_date format. Expected YYYY-MM-DD.'}
+    )
+    end_date = serializers.DateField(
+        required=False,
+        error_messages={'invalid': 'Invalid end_date format. Expected YYYY-MM-DD.'}
+    )
+
+
+class ReportQuerySerializer(ReportDateRangeSerializer):
+    """Validates the limit and date range query parameters of top-N reports"""
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=REPORT_LIMIT_MAX,
+        default=10,
+        error_messages={
+            'invalid': 'Limit must be a valid integer',
+            'min_value': f'Limit must be between 1 and {REPORT_LIMIT_MAX}',
+            'max_value': f'Limit must be between 1 and {REPORT_LIMIT_MAX}',
+        }
+    )
+
 
 class CustomerSummarySerializer(serializers.Serializer):
     """Serializer for customer summary report"""
@@ -19,19 +48,6 @@ class ProductSummarySerializer(serializers.Serializer):
     total_transactions = serializers.IntegerField()
 
 
-class TopCustomerSerializer(serializers.Serializer):
-    """Serializer for top customers list (bonus feature)"""
-    customer_id = serializers.UUIDField()
-    total_spent_pln = serializers.DecimalField(max_digits=12, decimal_places=2)
-    unique_products_count = serializers.IntegerField()
-    last_transaction_date = serializers.DateTimeField()
-    total_transactions = serializers.IntegerField()
-
-
-class TopProductSerializer(serializers.Serializer):
-    """Serializer for top products list (bonus feature)"""
-    product_id = serializers.UUIDField()
-    total_quantity_sold = serializers.IntegerField()
-    total_revenue_pln = serializers.DecimalField(max_digits=12, decimal_places=2)
-    unique_customers_count = serializers.IntegerField()
-    total_transactions = serializers.IntegerField()
\ No newline at end of file
+# Top-N reports list the same fields as the single-entity summaries
+TopCustomerSerializer = CustomerSummarySerializer
+TopProductSerializer = ProductSummarySerializer
@@ -1,21 +1,122 @@
+import functools
+import hashlib
+import inspect
+import uuid
 from decimal import Decimal
 from typing import Dict, Any, Optional
-from datetime import datetime, date
+from datetime import datetime, date, time, timedelta
 
-from django.db.models import Sum, Max
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.db.models import BigIntegerField, Count, ExpressionWrapper, F, Max, Sum
+from django.dispatch import receiver
+from django.utils import timezone
 
+from reports.models import CustomerSummaryMV, ProductSummaryMV
 from transactions.models import Transaction
-from utils.currency import convert_to_pln
+from utils.cache import cache_enabled
+from utils.currency import pln_expression
 from utils.logging_utils import get_logger, LoggingContextManager, log_exceptions, log_performance
 
+# Line revenue of a single transaction in cents of its original currency
+REVENUE_CENTS_EXPRESSION = ExpressionWrapper(
+    F('amount_cents') * F('quantity'),
+    output_field=BigIntegerField()
+)
+
+logger = get_logger(__name__)
+
+# Cache key holding the current generation of cached reports
+REPORTS_CACHE_VERSION_KEY = 'reports:version'
+
+# Bump whenever the content or formatting of report responses changes, so
+# cached reports and ETags produced by older code are never served
+REPORTS_FORMAT_VERSION = 1
+
+# Marks a cache miss, since None is a valid cached result for unknown entities
+_CACHE_MISS = object()
+
+
+def cache_report(prefix: str):
+    """
+    Cache a report method's result keyed by its bound arguments
+
+    Keys embed the current report generation, so invalidate_cached_reports()
+    drops every cached report at once on any cache backend.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = ':'.join(['reports', prefix, get_report_version(), *map(str, bound.arguments.values())])
+
+            result = cache.get(key, _CACHE_MISS)
+            if result is _CACHE_MISS:
+                result = func(*bound.args, **bound.kwargs)
+                cache.set(key, result, settings.REPORTS_CACHE_TTL)
+            return result
+        return wrapper
+    return decorator
+
+
+def get_report_version() -> str:
+    """
+    Return the current report version, starting a new generation if none is cached
+
+    The version combines the cached generation, which data changes advance, with
+    a fingerprint of the exchange rates, report format and release. Because the
+    generation never expires, changing any of those still yields new cache keys
+    and ETags.
+    """
+    generation = cache.get_or_set(REPORTS_CACHE_VERSION_KEY, lambda: uuid.uuid4().hex, None)
+    return f"{generation}.{_report_inputs_fingerprint()}"
+
+
+@functools.lru_cache(maxsize=None)
+def _report_inputs_fingerprint() -> str:
+    """Hash of the settings and code, besides the data, that report results depend on"""
+    rates = sorted((currency, str(rate)) for currency, rate in settings.CURRENCY_EXCHANGE_RATES.items())
+    inputs = repr((rates, REPORTS_FORMAT_VERSION, settings.RELEASE_VERSION))
+    return hashlib.sha256(inputs.encode()).hexdigest()[:16]
+
+
+@receiver(setting_changed)
+def _clear_report_fingerprint(setting, **kwargs):
+    """Recompute the fingerprint when exchange rates or the release are overridden"""
+    if setting in ('CURRENCY_EXCHANGE_RATES', 'RELEASE_VERSION'):
+        _report_inputs_fingerprint.cache_clear()
+
+
+def invalidate_cached_reports() -> None:
+    """Start a new report generation, making all cached reports unreachable"""
+    cache.set(REPORTS_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def report_etag(request, *args, **kwargs) -> Optional[str]:
+    """
+    ETag for condition() on report and transaction responses, built from the current
+    report generation and the request
+
+    Every transaction write and CSV import starts a new generation, so conditional GETs
+    are answered without touching the database. Without a shared cache there is no
+    generation every process agrees on, so no ETag is sent.
+    """
+    if not cache_enabled():
+        return None
+    fingerprint = f"{get_report_version()}:{request.get_full_path()}:{request.META.get('HTTP_ACCEPT', '')}"
+    return hashlib.md5(fingerprint.encode()).hexdigest()
+
 
 class ReportService:
     """Service for generating customer and product reports"""
 
     @staticmethod
-    @log_exceptions('reports.services.report_service')
-    @log_performance('reports.services.report_service', threshold=2.0)
-    def get_customer_summary(customer_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Optional[Dict[str, Any]]:
+    @cache_report('customer_summary')
+    def get_customer_summary(customer_id: uuid.UUID, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Optional[Dict[str, Any]]:
         """
         Generate customer summary report
 
@@ -28,81 +129,40 @@ class ReportService:
             dict: Customer summary with total_spent_pln, unique_products_count, last_transaction_date
             None: If customer not found or has no transactions
         """
-        logger = get_logger(__name__)
-        
-        with LoggingContextManager(logger, f"customer summary generation",
-                                   customer_id=customer_id):
-            try:
-                # Get all transactions for the customer with optional date filtering
-                customer_transactions = Transaction.objects.filter(customer_id=customer_id)
-                
-                # Apply date range filtering if provided
-                if start_date:
-                    customer_transactions = customer_transactions.filter(timestamp__date__gte=start_date)
-                if end_date:
-                    customer_transactions = customer_transactions.filter(timestamp__date__lte=end_date)
-
-                if not customer_transactions.exists():
-                    logger.warning(f"No transactions found for customer {customer_id}")
-                    return None
-
-                transaction_count = customer_transactions.count()
-                logger.info(f"Processing {transaction_count} transactions for customer {customer_id}")
-
-                # Calculate total spent in PLN (convert from different currencies)
-                total_spent_pln = Decimal('0.00')
-                conversion_errors = 0
-
-                for transaction in customer_transactions:
-                    try:
-                        amount_in_pln = convert_to_pln(transaction.amount, transaction.currency)
-                        total_spent_pln += amount_in_pln
-                    except Exception as e:
-                        conversion_errors += 1
-                        logger.error(
-                            f"Currency conversion failed for transaction {transaction.id}: {str(e)}",
-                            exc_info=True
-                        )
-
-                if conversion_errors > 0:
-                    logger.warning(
-                        f"Currency conversion errors: {conversion_errors} out of {transaction_count} transactions"
-                    )
-
-                # Count unique products purchased
-                unique_products = customer_transactions.values('product_id').distinct().count()
-
-                # Get last transaction date
-                last_transaction = customer_transactions.aggregate(
-                    last_date=Max('timestamp')
-                )['last_date']
-
-                summary = {
-                    'customer_id': customer_id,  # Keep as UUID for service layer
-                    'total_spent_pln': round(total_spent_pln, 2),  # Keep as Decimal for service layer
-                    'unique_products_count': unique_products,
-                    'last_transaction_date': last_transaction,  # Keep as datetime for service layer
-                    'total_transactions': transaction_count
-                }
-
-                logger.log_report_generation(
-                    "customer summary",
-                    customer_id
-                )
+        try:
+            # Aggregate the customer's transactions with optional date filtering
+            queryset, aggregates = ReportService._customer_statistics_source(start_date, end_date)
+            stats = queryset.filter(customer_id=customer_id).aggregate(**aggregates)
+            transaction_count = stats['total_transactions']
 
-                return summary
+            if not transaction_count:
+                logger.warning("No transactions found for customer %s", customer_id)
+                return None
 
-            except Exception as e:
-                logger.error(
-                    f"Error generating customer summary for {customer_id}: {str(e)}",
-                    exc_info=True
-                )
-                raise
+            logger.info("Processed %s transactions for customer %s", transaction_count, customer_id)
+
+            summary = {
+                'customer_id': customer_id,  # Keep as UUID for service layer
+                'total_spent_pln': round(stats['total_spent_pln'] or Decimal('0'), 2),  # Keep as Decimal for service layer
+                'unique_products_count': stats['unique_products_count'],
+                'last_transaction_date': stats['last_transaction_date'],  # Keep as datetime for service layer
+                'total_transactions': transaction_count
+            }
+
+            logger.log_report_generation(
+                "customer summary",
+                customer_id
+            )
+
+            return summary
+
+        except Exception as e:
+            logger.error("Error generating customer summary for %s: %s", customer_id, e, exc_info=True)
+            raise
 
     @staticmethod
-    @log_exceptions('reports.services.report_service')
-    @log_performance('reports.services.report_service', threshold=2.0)
-    def get_product_summary(product_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Optional[Dict[str, Any]]:
+    @cache_report('product_summary')
+    def get_product_summary(product_id: uuid.UUID, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Optional[Dict[str, Any]]:
         """
         Generate product summary report
 
@@ -115,174 +175,175 @@ class ReportService:
             dict: Product summary with total_quantity_sold, total_revenue_pln, unique_customers_count
             None: If product not found or has no transactions
         """
-        logger = get_logger(__name__)
-        
-        with LoggingContextManager(logger, f"product summary generation",
-                                   product_id=product_id):
-            try:
-                # Get all transactions for the product with optional date filtering
-                product_transactions = Transaction.objects.filter(product_id=product_id)
-                
-                # Apply date range filtering if provided
-                if start_date:
-                    product_transactions = product_transactions.filter(timestamp__date__gte=start_date)
-                if end_date:
-                    product_transactions = product_transactions.filter(timestamp__date__lte=end_date)
-
-                if not product_transactions.exists():
-                    logger.warning(f"No transactions found for product {product_id}")
-                    return None
-
-                transaction_count = product_transactions.count()
-                logger.info(f"Processing {transaction_count} transactions for product {product_id}")
-
-                # Calculate total quantity sold
-                total_quantity = product_transactions.aggregate(
-                    total=Sum('quantity')
-                )['total'] or 0
-
-                # Calculate total revenue in PLN (convert from different currencies)
-                total_revenue_pln = Decimal('0.00')
-                conversion_errors = 0
-
-                for transaction in product_transactions:
-                    try:
-                        transaction_revenue = transaction.amount * transaction.quantity
-                        revenue_in_pln = convert_to_pln(transaction_revenue, transaction.currency)
-                        total_revenue_pln += revenue_in_pln
-                    except Exception as e:
-                        conversion_errors += 1
-                        logger.error(
-                            f"Revenue calculation failed for transaction {transaction.id}: {str(e)}",
-                            exc_info=True
-                        )
-
-                if conversion_errors > 0:
-                    logger.warning(
-                        f"Revenue calculation errors: {conversion_errors} out of {transaction_count} transactions"
-                    )
-
-                # Count unique customers who bought this product
-                unique_customers = product_transactions.values('customer_id').distinct().count()
-
-                summary = {
-                    'product_id': product_id,  # Keep as UUID for service layer
-                    'total_quantity_sold': total_quantity,
-                    'total_revenue_pln': round(total_revenue_pln, 2),  # Keep as Decimal for service layer
-                    'unique_customers_count': unique_customers,
-                    'total_transactions': transaction_count
-                }
-
-                logger.log_report_generation(
-                    "product summary",
-                    product_id
-                )
+        try:
+            # Aggregate the product's transactions with optional date filtering
+            queryset, aggregates = ReportService._product_statistics_source(start_date, end_date)
+            stats = queryset.filter(product_id=product_id).aggregate(**aggregates)
+            transaction_count = stats['total_transactions']
 
-                return summary
+            if not transaction_count:
+                logger.warning("No transactions found for product %s", product_id)
+                return None
 
-            except Exception as e:
-                logger.error(
-                    f"Error generating product summary for {product_id}: {str(e)}",
-                    exc_info=True
-                )
-                raise
+            logger.info("Processed %s transactions for product %s", transaction_count, product_id)
+
+            summary = {
+                'product_id': product_id,  # Keep as UUID for service layer
+                'total_quantity_sold': stats['total_quantity_sold'] or 0,
+                'total_revenue_pln': round(stats['total_revenue_pln'] or Decimal('0'), 2),  # Keep as Decimal for service layer
+                'unique_customers_count': stats['unique_customers_count'],
+                'total_transactions': transaction_count
+            }
+
+            logger.log_report_generation(
+                "product summary",
+                product_id
+            )
+
+            return summary
+
+        except Exception as e:
+            logger.error("Error generating product summary for %s: %s", product_id, e, exc_info=True)
+            raise
 
     @staticmethod
+    @cache_report('top_customers')
     @log_exceptions('reports.services.report_service')
     @log_performance('reports.services.report_service', threshold=5.0)
     def get_top_customers_by_spending(limit: int = 10, start_date: Optional[date] = None, end_date: Optional[date] = None) -> list:
         """Get top customers by total spending with optional date range filtering"""
-        logger = get_logger(__name__)
-        
-        with LoggingContextManager(logger, f"top customers report generation", limit=limit):
+        with LoggingContextManager(logger, "top customers report generation", limit=limit):
             try:
-                customer_totals = []
-
-                # Get all unique customer IDs properly
-                unique_customer_ids = list(set(Transaction.objects.values_list('customer_id', flat=True)))
-                total_customers = len(unique_customer_ids)
-
-                logger.info(f"Processing {total_customers} unique customers for top spending report")
+                queryset, aggregates = ReportService._customer_statistics_source(start_date, end_date)
 
-                processed = 0
-                errors = 0
-
-                for customer_id in unique_customer_ids:
-                    try:
-                        summary = ReportService.get_customer_summary(customer_id, start_date, end_date)
-                        if summary:
-                            customer_totals.append(summary)
-                        processed += 1
-
-                        # Log progress for large datasets
-                        if processed % 100 == 0:
-                            logger.info(f"Processed {processed}/{total_customers} customers")
-
-                    except Exception as e:
-                        errors += 1
-                        logger.error(
-                            f"Error processing customer {customer_id}: {str(e)}"
-                        )
-
-                if errors > 0:
-                    logger.warning(f"Completed with {errors} errors out of {total_customers} customers")
-
-                # Sort by total spent (descending)
-                result = sorted(customer_totals, key=lambda x: x['total_spent_pln'], reverse=True)[:limit]
-
-                logger.info(f"Generated top {len(result)} customers report successfully")
+                # Rank customers by PLN spending in SQL and fetch only the top rows
+                ranked = (
+                    queryset.values('customer_id')
+                    .annotate(**aggregates)
+                    .order_by(F('total_spent_pln').desc(nulls_last=True), 'customer_id')[:limit]
+                )
+                result = [
+                    {
+                        'customer_id': row['customer_id'],
+                        'total_spent_pln': round(row['total_spent_pln'] or Decimal('0'), 2),
+                        'unique_products_count': row['unique_products_count'],
+                        'last_transaction_date': row['last_transaction_date'],
+                        'total_transactions': row['total_transactions']
+                    }
+                    for row in ranked
+                ]
+
+                logger.info("Generated top %s customers report successfully", len(result))
                 return result
 
             except Exception as e:
-                logger.error(f"Error generating top customers report: {str(e)}", exc_info=True)
+                logger.error("Error generating top customers report: %s", e, exc_info=True)
                 raise
 
     @staticmethod
+    @cache_report('top_products')
     @log_exceptions('reports.services.report_service')
     @log_performance('reports.services.report_service', threshold=5.0)
     def get_top_products_by_revenue(limit: int = 10, start_date: Optional[date] = None, end_date: Optional[date] = None) -> list:
         """Get top products by total revenue with optional date range filtering"""
-        logger = get_logger(__name__)
-        
-        with LoggingContextManager(logger, f"top products report generation", limit=limit):
+        with LoggingContextManager(logger, "top products report generation", limit=limit):
             try:
-                product_totals = []
+                queryset, aggregates = ReportService._product_statistics_source(start_date, end_date)
 
-                # Get all unique product IDs properly
-                unique_product_ids = list(set(Transaction.objects.values_list('product_id', flat=True)))
-                total_products = len(unique_product_ids)
-
-                logger.info(f"Processing {total_products} unique products for top revenue report")
+                # Rank products by PLN revenue in SQL and fetch only the top rows
+                ranked = (
+                    queryset.values('product_id')
+                    .annotate(**aggregates)
+                    .order_by(F('total_revenue_pln').desc(nulls_last=True), 'product_id')[:limit]
+                )
+                result = [
+                    {
+                        'product_id': row['product_id'],
+                        'total_quantity_sold': row['total_quantity_sold'] or 0,
+                        'total_revenue_pln': round(row['total_revenue_pln'] or Decimal('0'), 2),
+                        'unique_customers_count': row['unique_customers_count'],
+                        'total_transactions': row['total_transactions']
+                    }
+                    for row in ranked
+                ]
+
+                logger.info("Generated top %s products report successfully", len(result))
+                return result
 
-                processed = 0
-                errors = 0
+            except Exception as e:
+                logger.error("Error generating top products report: %s", e, exc_info=True)
+                raise
 
-                for product_id in unique_product_ids:
-                    try:
-                        summary = ReportService.get_product_summary(product_id, start_date, end_date)
-                        if summary:
-                            product_totals.append(summary)
-                        processed += 1
+    @staticmethod
+    def _use_materialized_views(start_date: Optional[date] = None, end_date: Optional[date] = None) -> bool:
+        """Materialized views hold all-time totals, so they can only serve unfiltered reports"""
+        return settings.REPORTS_USE_MATERIALIZED_VIEWS and not start_date and not end_date
 
-                        # Log progress for large datasets
-                        if processed % 100 == 0:
-                            logger.info(f"Processed {processed}/{total_products} products")
+    @staticmethod
+    def _customer_statistics_source(start_date: Optional[date] = None, end_date: Optional[date] = None):
+        """
+        Return the queryset and aggregate expressions producing per-customer statistics,
+        read from customer_summary_mv when possible and from raw transactions otherwise
+        """
+        if ReportService._use_materialized_views(start_date, end_date):
+            return CustomerSummaryMV.objects.all(), {
+                'total_transactions': Sum('transaction_count'),
+                'unique_products_count': Max('product_count'),
+                'last_transaction_date': Max('last_timestamp'),
+                'total_spent_pln': Sum(pln_expression(F('amount_sum')))
+            }
+
+        transactions = ReportService._filter_by_date_range(Transaction.objects.order_by(), start_date, end_date)
+        return transactions, {
+            'total_transactions': Count('transaction_id'),
+            'unique_products_count': Count('product_id', distinct=True),
+            'last_transaction_date': Max('timestamp'),
+            'total_spent_pln': ReportService._cents_to_units(Sum(pln_expression(F('amount_cents'))))
+        }
 
-                    except Exception as e:
-                        errors += 1
-                        logger.error(
-                            f"Error processing product {product_id}: {str(e)}"
-                        )
+    @staticmethod
+    def _product_statistics_source(start_date: Optional[date] = None, end_date: Optional[date] = None):
+        """
+        Return the queryset and aggregate expressions producing per-product statistics,
+        read from product_summary_mv when possible and from raw transactions otherwise
+        """
+        if ReportService._use_materialized_views(start_date, end_date):
+            return ProductSummaryMV.objects.all(), {
+                'total_transactions': Sum('transaction_count'),
+                'total_quantity_sold': Sum('quantity_sum'),
+                'unique_customers_count': Max('customer_count'),
+                'total_revenue_pln': Sum(pln_expression(F('revenue_sum')))
+            }
+
+        transactions = ReportService._filter_by_date_range(Transaction.objects.order_by(), start_date, end_date)
+        return transactions, {
+            'total_transactions': Count('transaction_id'),
+            'total_quantity_sold': Sum('quantity'),
+            'unique_customers_count': Count('customer_id', distinct=True),
+            'total_revenue_pln': ReportService._cents_to_units(Sum(pln_expression(REVENUE_CENTS_EXPRESSION)))
+        }
 
-                if errors > 0:
-                    logger.warning(f"Completed with {errors} errors out of {total_products} products")
+    @staticmethod
+    def _cents_to_units(total):
+        """Convert a summed amount in cents to currency units, dividing once per group"""
+        return total / 100
 
-                # Sort by total revenue (descending)
-                result = sorted(product_totals, key=lambda x: x['total_revenue_pln'], reverse=True)[:limit]
+    @staticmethod
+    def _filter_by_date_range(queryset, start_date: Optional[date] = None, end_date: Optional[date] = None):
+        """
+        Restrict a transaction queryset to the optional date range
 
-                logger.info(f"Generated top {len(result)} products report successfully")
-                return result
+        Dates are turned into [start of start_date, start of the day after end_date)
+        datetime bounds in the current time zone, so the filter compares the raw
+        timestamp column and can use its indexes.
+        """
+        if start_date:
+            queryset = queryset.filter(timestamp__gte=ReportService._start_of_day(start_date))
+        if end_date:
+            queryset = queryset.filter(timestamp__lt=ReportService._start_of_day(end_date + timedelta(days=1)))
+        return queryset
 
-            except Exception as e:
-                logger.error(f"Error generating top products report: {str(e)}", exc_info=True)
-                raise
\ No newline at end of file
+    @staticmethod
+    def _start_of_day(day: date) -> datetime:
+        """Return midnight of the given day as an aware datetime in the current time zone"""
+        return timezone.make_aware(datetime.combine(day, time.min))
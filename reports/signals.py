@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from transactions.models import Transaction
+from .services.report_service import invalidate_cached_reports
+from .tasks import refresh_report_views
+
+
+@receiver([post_save, post_delete], sender=Transaction)
+def invalidate_reports_on_transaction_change(sender, **kwargs):
+    """
+    Row-level writes outside the CSV import (e.g. admin edits) change report results too.
+    bulk_create()/update() send no signals, so bulk writers invalidate explicitly.
+    Materialized views would keep serving the old rows, so they are refreshed once
+    the change is committed.
+    """
+    invalidate_cached_reports()
+    if settings.REPORTS_USE_MATERIALIZED_VIEWS:
+        transaction.on_commit(refresh_report_views.delay)
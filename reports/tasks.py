@@ -0,0 +1,18 @@
+import logging
+from celery import shared_task
+
+from .models import CustomerSummaryMV, ProductSummaryMV
+from .services.report_service import invalidate_cached_reports
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_report_views():
+    """
+    Asynchronous task to refresh the report materialized views
+    """
+    for view in (CustomerSummaryMV, ProductSummaryMV):
+        view.refresh()
+    invalidate_cached_reports()
+    logger.info("Refreshed report materialized views")
@@ -3,7 +3,6 @@ import uuid
 import pytest
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APIClient
 
 
 @pytest.mark.integration
@@ -99,26 +98,11 @@ class TestReportsViews:
         results = data['results']
         assert len(results) == 2
 
-        # Customer 1 should be first (315 PLN > 325 PLN)
-        customer_1_id = '550e8400-e29b-41d4-a716-446655440001'
-        customer_2_id = '550e8400-e29b-41d4-a716-446655440002'
-
         # Check that customers are sorted by spending
         first_customer_spending = float(results[0]['total_spent_pln'])
         second_customer_spending = float(results[1]['total_spent_pln'])
         assert first_customer_spending >= second_customer_spending
 
-    def test_top_customers_with_limit(self, db, api_client, multiple_transactions):
-        """Test top customers with limit parameter"""
-        url = reverse('top-customers')
-        response = api_client.get(url, {'limit': 1})
-
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-
-        assert data['count'] == 1
-        assert len(data['results']) == 1
-
     def test_top_products_success(self, db, api_client, multiple_transactions):
         """Test top products endpoint"""
         url = reverse('top-products')
@@ -139,24 +123,21 @@ class TestReportsViews:
         second_product_revenue = float(results[1]['total_revenue_pln'])
         assert first_product_revenue >= second_product_revenue
 
-    def test_top_products_with_limit(self, db, api_client, multiple_transactions):
-        """Test top products with limit parameter"""
-        url = reverse('top-products')
-        response = api_client.get(url, {'limit': 1})
+    @pytest.mark.parametrize('url_name, limit, expected_count', [
+        ('top-customers', 1, 1),
+        ('top-customers', 100, 2),
+        ('top-products', 1, 1),
+        ('top-products', 100, 2),
+    ])
+    def test_top_reports_with_limit(self, db, api_client, multiple_transactions, url_name, limit, expected_count):
+        """Test top reports honour the limit parameter up to its maximum of 100"""
+        response = api_client.get(reverse(url_name), {'limit': limit})
 
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
 
-        assert data['count'] == 1
-        assert len(data['results']) == 1
-
-    def test_top_customers_limit_protection(self, db, api_client, multiple_transactions):
-        """Test that top customers limit is capped at 50"""
-        url = reverse('top-customers')
-        response = api_client.get(url, {'limit': 100})
-
-        assert response.status_code == status.HTTP_200_OK
-        # Should work but internally limit to 50
+        assert data['count'] == expected_count
+        assert len(data['results']) == expected_count
 
     def test_invalid_uuid_in_customer_summary(self, db, api_client):
         """Test customer summary with invalid UUID"""
@@ -172,4 +153,50 @@ class TestReportsViews:
         response = api_client.get(url)
 
         # Should return 404 due to URL pattern not matching
-        assert response.status_code == status.HTTP_404_NOT_FOUND
\ No newline at end of file
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_top_customers_invalid_limit(self, db, api_client):
+        """Test that an out-of-range or non-numeric limit returns 400"""
+        url = reverse('top-customers')
+
+        response = api_client.get(url, {'limit': 101})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()['error'] == 'Limit must be between 1 and 100'
+
+        response = api_client.get(url, {'limit': 'abc'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_invalid_date_parameter(self, db, api_client):
+        """Test that a malformed date returns 400"""
+        url = reverse('product-summary', args=['6ba7b810-9dad-11d1-80b4-00c04fd430c8'])
+        response = api_client.get(url, {'start_date': '2024-13-01'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'start_date' in response.json()['error']
+
+    def test_conditional_get_returns_not_modified(self, db, api_client, multiple_transactions):
+        """Test that a matching If-None-Match returns 304 until transactions change"""
+        url = reverse('top-customers')
+        response = api_client.get(url)
+        etag = response['ETag']
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        multiple_transactions[0].delete()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_no_etag_or_caching_without_shared_cache(self, db, api_client, multiple_transactions, settings):
+        """Test that without a shared cache reports are recomputed and carry no ETag"""
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        url = reverse('customer-summary', args=['550e8400-e29b-41d4-a716-446655440001'])
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert not response.has_header('ETag')
+
+        multiple_transactions[0].delete()
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['total_transactions'] == 1
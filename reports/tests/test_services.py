@@ -1,9 +1,13 @@
 import uuid
+from datetime import date
 from decimal import Decimal
 
 import pytest
+from django.utils import timezone
 
-from reports.services.report_service import ReportService
+from reports.models import CustomerSummaryMV, ProductSummaryMV
+from reports.services.report_service import ReportService, get_report_version, invalidate_cached_reports
+from reports.tasks import refresh_report_views
 
 
 @pytest.mark.unit
@@ -57,6 +61,18 @@ class TestReportService:
         # Product 1: (100 * 2) + (75 * 4.0 * 3) = 200 + 900 = 1100 PLN
         assert float(summary['total_revenue_pln']) == 1100.00
 
+    def test_summaries_use_single_query(self, db, multiple_transactions, django_assert_num_queries):
+        """Test that each summary, including the empty case, is one aggregate query"""
+        customer_id = uuid.UUID('550e8400-e29b-41d4-a716-446655440001')
+        product_id = uuid.UUID('6ba7b810-9dad-11d1-80b4-00c04fd430c8')
+
+        with django_assert_num_queries(1):
+            ReportService.get_customer_summary(customer_id)
+        with django_assert_num_queries(1):
+            ReportService.get_product_summary(product_id)
+        with django_assert_num_queries(1):
+            assert ReportService.get_customer_summary(uuid.uuid4()) is None
+
     def test_product_summary_nonexistent_product(self, db):
         """Test product summary for non-existent product"""
         nonexistent_product = uuid.uuid4()
@@ -89,6 +105,50 @@ class TestReportService:
         customer_2_id = uuid.UUID('550e8400-e29b-41d4-a716-446655440002')
         assert top_customers[0]['customer_id'] == customer_2_id
 
+    def test_top_customers_limit_applied_in_sql(self, db, multiple_transactions, django_assert_num_queries):
+        """Test that the ranking and limit run in a single SQL query"""
+        with django_assert_num_queries(1) as captured:
+            ReportService.get_top_customers_by_spending(limit=1)
+
+        sql = captured.captured_queries[0]['sql']
+        assert 'ORDER BY' in sql
+        assert 'LIMIT 1' in sql
+
+    def test_top_customers_with_date_range(self, db, multiple_transactions):
+        """Test top customers only include transactions inside the date range"""
+        top_customers = ReportService.get_top_customers_by_spending(
+            limit=10, end_date=date(2024, 1, 16)
+        )
+
+        # Only Customer 1 has transactions up to 2024-01-16
+        assert len(top_customers) == 1
+        assert top_customers[0]['customer_id'] == uuid.UUID('550e8400-e29b-41d4-a716-446655440001')
+        assert top_customers[0]['total_spent_pln'] == Decimal('315.00')
+        assert top_customers[0]['total_transactions'] == 2
+
+    def test_date_range_bounds_are_whole_days(self, db):
+        """Test end_date includes its last second and excludes the next midnight"""
+        from datetime import datetime
+        from transactions.models import Transaction
+
+        customer_id = uuid.uuid4()
+        for timestamp in (datetime(2024, 1, 15, 0, 0, 0), datetime(2024, 1, 16, 23, 59, 59),
+                          datetime(2024, 1, 17, 0, 0, 0)):
+            Transaction.objects.create(
+                transaction_id=uuid.uuid4(),
+                timestamp=timezone.make_aware(timestamp),
+                amount=Decimal('10.00'),
+                currency='PLN',
+                customer_id=customer_id,
+                product_id=uuid.uuid4(),
+                quantity=1
+            )
+
+        summary = ReportService.get_customer_summary(
+            customer_id, start_date=date(2024, 1, 15), end_date=date(2024, 1, 16)
+        )
+        assert summary['total_transactions'] == 2
+
     def test_top_products_by_revenue(self, db, multiple_transactions):
         """Test top products ranking"""
         top_products = ReportService.get_top_products_by_revenue(limit=10)
@@ -144,4 +204,166 @@ class TestReportService:
         summary = ReportService.get_customer_summary(customer_id)
 
         # Should be rounded to 2 decimal places: 143.32
-        assert summary['total_spent_pln'] == Decimal('143.32')
\ No newline at end of file
+        assert summary['total_spent_pln'] == Decimal('143.32')
+
+    def test_overridden_exchange_rates_apply(self, db, settings, multiple_transactions):
+        """Test that overriding exchange rates refreshes the cached conversion expression"""
+        customer_id = uuid.UUID('550e8400-e29b-41d4-a716-446655440001')
+        settings.CURRENCY_EXCHANGE_RATES = {'EUR': 5.0, 'USD': 4.0, 'PLN': 1.0}
+
+        summary = ReportService.get_customer_summary(customer_id)
+
+        # 100 PLN + 50 EUR * 5.0
+        assert summary['total_spent_pln'] == Decimal('350.00')
+
+    def test_changed_exchange_rates_bypass_cached_reports(self, db, settings, multiple_transactions):
+        """Test that reports cached under other exchange rates are not served"""
+        customer_id = uuid.UUID('550e8400-e29b-41d4-a716-446655440001')
+        assert ReportService.get_customer_summary(customer_id)['total_spent_pln'] == Decimal('315.00')
+        version = get_report_version()
+
+        settings.CURRENCY_EXCHANGE_RATES = {'EUR': 5.0, 'USD': 4.0, 'PLN': 1.0}
+
+        assert get_report_version() != version
+        assert ReportService.get_customer_summary(customer_id)['total_spent_pln'] == Decimal('350.00')
+
+    def test_release_version_changes_report_version(self, settings):
+        """Test that a new release starts from fresh report cache keys and ETags"""
+        version = get_report_version()
+
+        settings.RELEASE_VERSION = 'next-release'
+
+        assert get_report_version() != version
+
+
+@pytest.mark.unit
+class TestReportServiceCache:
+    """Test caching of report results"""
+
+    def test_top_customers_served_from_cache(self, db, multiple_transactions, django_assert_num_queries):
+        """Test a repeated call with the same arguments skips the database"""
+        first = ReportService.get_top_customers_by_spending(limit=10)
+
+        with django_assert_num_queries(0):
+            assert ReportService.get_top_customers_by_spending(limit=10) == first
+
+    def test_summary_served_from_cache(self, db, multiple_transactions, django_assert_num_queries):
+        """Test repeated summaries, including not-found results, skip the database"""
+        customer_id = uuid.UUID('550e8400-e29b-41d4-a716-446655440001')
+        missing_id = uuid.uuid4()
+        summary = ReportService.get_customer_summary(customer_id)
+        ReportService.get_product_summary(missing_id)
+
+        with django_assert_num_queries(0):
+            assert ReportService.get_customer_summary(customer_id) == summary
+            assert ReportService.get_product_summary(missing_id) is None
+
+    def test_cache_keyed_by_arguments(self, db, multiple_transactions):
+        """Test different filters are cached separately"""
+        assert len(ReportService.get_top_products_by_revenue(limit=10)) == 2
+        assert len(ReportService.get_top_products_by_revenue(limit=1)) == 1
+        assert len(ReportService.get_top_products_by_revenue(limit=10, end_date=date(2024, 1, 15))) == 1
+
+    def test_invalidation_drops_cached_reports(self, db, multiple_transactions):
+        """Test bulk-created transactions appear once the cache is invalidated"""
+        from transactions.models import Transaction
+
+        ReportService.get_top_customers_by_spending(limit=10)
+        Transaction.objects.bulk_create([Transaction(
+            transaction_id=uuid.uuid4(),
+            timestamp=timezone.now(),
+            amount=Decimal('1000.00'),
+            currency='PLN',
+            customer_id=uuid.uuid4(),
+            product_id=uuid.uuid4(),
+            quantity=1
+        )])
+        assert len(ReportService.get_top_customers_by_spending(limit=10)) == 2
+
+        invalidate_cached_reports()
+        top_customers = ReportService.get_top_customers_by_spending(limit=10)
+        assert len(top_customers) == 3
+        assert top_customers[0]['total_spent_pln'] == Decimal('1000.00')
+
+    def test_saved_transactions_invalidate_cache(self, db, multiple_transactions):
+        """Test saving or deleting a single transaction invalidates cached reports"""
+        customer_id = uuid.UUID('550e8400-e29b-41d4-a716-446655440001')
+        assert ReportService.get_customer_summary(customer_id)['total_transactions'] == 2
+
+        transaction = multiple_transactions[0]
+        transaction.delete()
+        assert ReportService.get_customer_summary(customer_id)['total_transactions'] == 1
+
+
+@pytest.mark.integration
+class TestReportServiceMaterializedViews:
+    """Test reports served from the summary materialized views"""
+
+    @pytest.fixture
+    def refreshed_views(self, db, settings, multiple_transactions):
+        settings.REPORTS_USE_MATERIALIZED_VIEWS = True
+        CustomerSummaryMV.refresh(concurrently=False)
+        ProductSummaryMV.refresh(concurrently=False)
+
+    def test_customer_summary_from_view(self, refreshed_views):
+        """Test customer summary matches the live aggregation"""
+        customer_id = uuid.UUID('550e8400-e29b-41d4-a716-446655440001')
+        summary = ReportService.get_customer_summary(customer_id)
+
+        assert summary['total_transactions'] == 2
+        assert summary['unique_products_count'] == 2
+        assert summary['total_spent_pln'] == Decimal('315.00')
+        assert summary['last_transaction_date'] is not None
+
+    def test_product_summary_from_view(self, refreshed_views):
+        """Test product summary matches the live aggregation"""
+        product_id = uuid.UUID('6ba7b810-9dad-11d1-80b4-00c04fd430c8')
+        summary = ReportService.get_product_summary(product_id)
+
+        assert summary['total_transactions'] == 2
+        assert summary['unique_customers_count'] == 2
+        assert summary['total_quantity_sold'] == 5
+        assert summary['total_revenue_pln'] == Decimal('1100.00')
+
+    def test_top_customers_from_view(self, refreshed_views):
+        """Test top customers ranking from the view"""
+        top_customers = ReportService.get_top_customers_by_spending(limit=10)
+
+        assert [c['total_spent_pln'] for c in top_customers] == [Decimal('325.00'), Decimal('315.00')]
+
+    def test_view_is_stale_until_refreshed(self, refreshed_views):
+        """Test new transactions only appear after a refresh"""
+        from transactions.models import Transaction
+
+        customer_id = uuid.uuid4()
+        Transaction.objects.create(
+            transaction_id=uuid.uuid4(),
+            timestamp=timezone.now(),
+            amount=Decimal('10.00'),
+            currency='PLN',
+            customer_id=customer_id,
+            product_id=uuid.uuid4(),
+            quantity=1
+        )
+        assert ReportService.get_customer_summary(customer_id) is None
+
+        refresh_report_views()
+        assert ReportService.get_customer_summary(customer_id)['total_spent_pln'] == Decimal('10.00')
+
+    def test_transaction_delete_refreshes_views_on_commit(self, refreshed_views, multiple_transactions,
+                                                          monkeypatch, django_capture_on_commit_callbacks):
+        """Test that deleting a transaction outside an import refreshes the views once committed"""
+        monkeypatch.setattr(refresh_report_views, 'delay', refresh_report_views)
+        customer_id = uuid.UUID('550e8400-e29b-41d4-a716-446655440001')
+
+        with django_capture_on_commit_callbacks(execute=True):
+            multiple_transactions[0].delete()
+
+        assert ReportService.get_customer_summary(customer_id)['total_transactions'] == 1
+
+    def test_date_filtered_reports_bypass_view(self, refreshed_views):
+        """Test date-filtered reports are computed from raw transactions"""
+        customer_id = uuid.UUID('550e8400-e29b-41d4-a716-446655440001')
+        summary = ReportService.get_customer_summary(customer_id, start_date=date(2024, 1, 16))
+
+        assert summary['total_transactions'] == 1
@@ -1,26 +1,50 @@
 import logging
-from datetime import datetime
+
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from reports.services.report_service import ReportService
-from .serializers import CustomerSummarySerializer, ProductSummarySerializer
+from reports.services.report_service import ReportService, report_etag
+from .serializers import (
+    CustomerSummarySerializer, ProductSummarySerializer, ReportDateRangeSerializer, ReportQuerySerializer,
+    TopCustomerSerializer, TopProductSerializer
+)
 
 logger = logging.getLogger(__name__)
 
 
-def parse_date_parameter(date_str):
-    """Parse date string in YYYY-MM-DD format"""
-    if not date_str:
-        return None
-    try:
-        return datetime.strptime(date_str, '%Y-%m-%d').date()
-    except ValueError:
-        raise ValueError(f"Invalid date format. Expected YYYY-MM-DD, got: {date_str}")
+class ReportParamsMixin:
+    """Query parameter parsing shared by the report views"""
+
+    @staticmethod
+    def _validate(serializer_class, request):
+        """
+        Return the validated query parameters
+
+        Raises:
+            ValueError: With the first validation message, rendered as a 400 by the views
+        """
+        query = serializer_class(data=request.query_params)
+        if not query.is_valid():
+            messages = next(iter(query.errors.values()))
+            raise ValueError(messages[0])
+        return query.validated_data
+
+    def _parse_date_range(self, request):
+        """Return (start_date, end_date) from the query parameters"""
+        params = self._validate(ReportDateRangeSerializer, request)
+        return params.get('start_date'), params.get('end_date')
 
+    def _parse(self, request):
+        """Return (limit, start_date, end_date) from the query parameters"""
+        params = self._validate(ReportQuerySerializer, request)
+        return params['limit'], params.get('start_date'), params.get('end_date')
 
-class CustomerSummaryView(APIView):
+
+@method_decorator(condition(etag_func=report_etag), name='get')
+class CustomerSummaryView(ReportParamsMixin, APIView):
     """
     Get customer summary report
     GET /api/reports/customer-summary/{customer_id}/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
@@ -29,11 +53,10 @@ class CustomerSummaryView(APIView):
     def get(self, request, customer_id):
         try:
             # Parse date parameters
-            start_date = parse_date_parameter(request.query_params.get('start_date'))
-            end_date = parse_date_parameter(request.query_params.get('end_date'))
+            start_date, end_date = self._parse_date_range(request)
 
             # Generate customer summary with optional date filtering
-            summary = ReportService.get_customer_summary(str(customer_id), start_date, end_date)
+            summary = ReportService.get_customer_summary(customer_id, start_date, end_date)
 
             if summary is None:
                 date_filter = ""
@@ -46,7 +69,7 @@ class CustomerSummaryView(APIView):
 
             # Serialize and return the data
             serializer = CustomerSummarySerializer(summary)
-            logger.info(f"Generated customer summary for {customer_id}")
+            logger.info("Generated customer summary for %s", customer_id)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         except ValueError as e:
@@ -55,14 +78,15 @@ class CustomerSummaryView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Error generating customer summary for {customer_id}: {str(e)}")
+            logger.exception("Error generating customer summary for %s", customer_id)
             return Response(
                 {'error': f'Failed to generate customer summary: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
 
-class ProductSummaryView(APIView):
+@method_decorator(condition(etag_func=report_etag), name='get')
+class ProductSummaryView(ReportParamsMixin, APIView):
     """
     Get product summary report
     GET /api/reports/product-summary/{product_id}/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
@@ -71,11 +95,10 @@ class ProductSummaryView(APIView):
     def get(self, request, product_id):
         try:
             # Parse date parameters
-            start_date = parse_date_parameter(request.query_params.get('start_date'))
-            end_date = parse_date_parameter(request.query_params.get('end_date'))
+            start_date, end_date = self._parse_date_range(request)
 
             # Generate product summary with optional date filtering
-            summary = ReportService.get_product_summary(str(product_id), start_date, end_date)
+            summary = ReportService.get_product_summary(product_id, start_date, end_date)
 
             if summary is None:
                 date_filter = ""
@@ -88,7 +111,7 @@ class ProductSummaryView(APIView):
 
             # Serialize and return the data
             serializer = ProductSummarySerializer(summary)
-            logger.info(f"Generated product summary for {product_id}")
+            logger.info("Generated product summary for %s", product_id)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         except ValueError as e:
@@ -97,14 +120,15 @@ class ProductSummaryView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Error generating product summary for {product_id}: {str(e)}")
+            logger.exception("Error generating product summary for %s", product_id)
             return Response(
                 {'error': f'Failed to generate product summary: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
 
-class TopCustomersView(APIView):
+@method_decorator(condition(etag_func=report_etag), name='get')
+class TopCustomersView(ReportParamsMixin, APIView):
     """
     Get top customers by spending
     GET /api/reports/top-customers/?limit=10&start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
@@ -112,39 +136,20 @@ class TopCustomersView(APIView):
 
     def get(self, request):
         try:
-            # Get limit from query parameters, default to 10
-            limit = int(request.query_params.get('limit', 10))
-
-            # Validate limit
-            if limit <= 0 or limit > 100:
-                return Response(
-                    {'error': 'Limit must be between 1 and 100'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            # Parse date parameters
-            start_date = parse_date_parameter(request.query_params.get('start_date'))
-            end_date = parse_date_parameter(request.query_params.get('end_date'))
+            # Parse and validate limit and date parameters
+            limit, start_date, end_date = self._parse(request)
 
             # Generate top customers report with optional date filtering
             top_customers = ReportService.get_top_customers_by_spending(limit, start_date, end_date)
 
-            # Convert data for JSON serialization
-            results = []
-            for customer in top_customers:
-                result = customer.copy()
-                result['customer_id'] = str(result['customer_id'])
-                result['total_spent_pln'] = str(result['total_spent_pln'])
-                if result['last_transaction_date']:
-                    result['last_transaction_date'] = result['last_transaction_date'].isoformat()
-                results.append(result)
+            count = len(top_customers)
 
             # Return paginated response format
             response_data = {
-                'count': len(results),
-                'results': results
+                'count': count,
+                'results': TopCustomerSerializer(top_customers, many=True).data
             }
-            logger.info(f"Generated top {len(top_customers)} customers report")
+            logger.info("Generated top %s customers report", count)
             return Response(response_data, status=status.HTTP_200_OK)
 
         except ValueError as e:
@@ -153,14 +158,15 @@ class TopCustomersView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Error generating top customers report: {str(e)}")
+            logger.exception("Error generating top customers report")
             return Response(
                 {'error': f'Failed to generate top customers report: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
 
-class TopProductsView(APIView):
+@method_decorator(condition(etag_func=report_etag), name='get')
+class TopProductsView(ReportParamsMixin, APIView):
     """
     Get top products by revenue
     GET /api/reports/top-products/?limit=10&start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
@@ -168,37 +174,20 @@ class TopProductsView(APIView):
 
     def get(self, request):
         try:
-            # Get limit from query parameters, default to 10
-            limit = int(request.query_params.get('limit', 10))
-
-            # Validate limit
-            if limit <= 0 or limit > 100:
-                return Response(
-                    {'error': 'Limit must be between 1 and 100'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            # Parse date parameters
-            start_date = parse_date_parameter(request.query_params.get('start_date'))
-            end_date = parse_date_parameter(request.query_params.get('end_date'))
+            # Parse and validate limit and date parameters
+            limit, start_date, end_date = self._parse(request)
 
             # Generate top products report with optional date filtering
             top_products = ReportService.get_top_products_by_revenue(limit, start_date, end_date)
 
-            # Convert data for JSON serialization
-            results = []
-            for product in top_products:
-                result = product.copy()
-                result['product_id'] = str(result['product_id'])
-                result['total_revenue_pln'] = str(result['total_revenue_pln'])
-                results.append(result)
+            count = len(top_products)
 
             # Return paginated response format
             response_data = {
-                'count': len(results),
-                'results': results
+                'count': count,
+                'results': TopProductSerializer(top_products, many=True).data
             }
-            logger.info(f"Generated top {len(top_products)} products report")
+            logger.info("Generated top %s products report", count)
             return Response(response_data, status=status.HTTP_200_OK)
 
         except ValueError as e:
@@ -207,7 +196,7 @@ class TopProductsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Error generating top products report: {str(e)}")
+            logger.exception("Error generating top products report")
             return Response(
                 {'error': f'Failed to generate top products report: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -6,7 +6,7 @@ from .models import ApiToken
 class ApiTokenAdmin(admin.ModelAdmin):
     list_display = ['name', 'is_active', 'created_at', 'last_used_at', 'token_preview']
     list_filter = ['is_active', 'created_at', 'last_used_at']
-    search_fields = ['name', 'token']
+    search_fields = ['name']
     readonly_fields = ['created_at', 'last_used_at']
 
     def token_preview(self, obj):
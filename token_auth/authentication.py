@@ -0,0 +1,53 @@
+import logging
+
+from django.contrib.auth.models import AnonymousUser
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication
+
+from .models import ApiToken
+
+logger = logging.getLogger(__name__)
+
+
+class ApiTokenAuthentication(BaseAuthentication):
+    """
+    Simple token-based authentication for API views
+    Token is expected as URL parameter: ?token=your_token_here
+
+    Runs as part of DRF's request handling, so only API views authenticate and
+    failures are rendered like any other API error. Successful requests are
+    authenticated as (AnonymousUser, token).
+    """
+
+    def authenticate(self, request):
+        # Get token from URL parameter; a query string that cannot contain one
+        # is rejected without being parsed into query_params
+        token = request.query_params.get('token') if 'token' in request.META.get('QUERY_STRING', '') else None
+
+        if not token:
+            raise exceptions.NotAuthenticated('Token parameter required in URL.')
+
+        token = token.strip()
+
+        if not token:
+            raise exceptions.AuthenticationFailed('Token parameter cannot be empty.')
+
+        # Validate token
+        try:
+            is_active = ApiToken.is_active_token(token)
+            if is_active:
+                ApiToken.record_use(token)
+        except Exception as e:
+            logger.error("Authentication error: %s", e)
+            raise exceptions.APIException('Authentication failed')
+
+        if not is_active:
+            logger.warning("Invalid API token used: %s...", token[:8])
+            raise exceptions.AuthenticationFailed('Invalid or inactive token')
+
+        logger.info("API request authenticated with token: %s...", token[:8])
+        return AnonymousUser(), token
+
+    def authenticate_header(self, request):
+        """Challenge returned with 401 responses"""
+        return 'Token'
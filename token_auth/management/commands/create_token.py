@@ -1,4 +1,5 @@
 from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
 from token_auth.models import ApiToken
 
 
@@ -22,29 +23,28 @@ class Command(BaseCommand):
         is_active = not options['inactive']
 
         try:
-            # Check if token with this name already exists
-            if ApiToken.objects.filter(name=name).exists():
-                raise CommandError(f'Token with name "{name}" already exists')
-
-            # Create the token
-            token = ApiToken.objects.create(
-                name=name,
-                is_active=is_active
-            )
+            # Create the token; the unique name constraint rejects duplicates. The
+            # savepoint keeps a caller's transaction usable after a rejection
+            with transaction.atomic():
+                token = ApiToken.objects.create(
+                    name=name,
+                    is_active=is_active
+                )
+        except IntegrityError:
+            raise CommandError(f'Token with name "{name}" already exists')
+        except Exception as e:
+            raise CommandError(f'Error creating token: {str(e)}')
 
-            # Print success message with token
+        # Print success message with token
+        self.stdout.write(
+            self.style.SUCCESS('Successfully created API token')
+        )
+        self.stdout.write(f'Name: {token.name}')
+        self.stdout.write(f'Token: {token.token}')
+        self.stdout.write(f'Active: {token.is_active}')
+        self.stdout.write(f'Created: {token.created_at}')
+        
+        if not is_active:
             self.stdout.write(
-                self.style.SUCCESS('Successfully created API token')
+                self.style.WARNING('Token is inactive. Activate it in Django admin or create without --inactive flag.')
             )
-            self.stdout.write(f'Name: {token.name}')
-            self.stdout.write(f'Token: {token.token}')
-            self.stdout.write(f'Active: {token.is_active}')
-            self.stdout.write(f'Created: {token.created_at}')
-            
-            if not is_active:
-                self.stdout.write(
-                    self.style.WARNING('Token is inactive. Activate it in Django admin or create without --inactive flag.')
-                )
-
-        except Exception as e:
-            raise CommandError(f'Error creating token: {str(e)}')
\ No newline at end of file
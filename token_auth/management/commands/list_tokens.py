@@ -23,28 +23,34 @@ class Command(BaseCommand):
         if options['active_only']:
             queryset = queryset.filter(is_active=True)
 
-        if not queryset.exists():
-            self.stdout.write(
-                self.style.WARNING('No API tokens found')
-            )
-            return
+        # Stream plain tuples in one query instead of materializing model instances
+        rows = queryset.values_list(
+            'name', 'is_active', 'token', 'created_at', 'last_used_at'
+        ).iterator(chunk_size=500)
 
-        self.stdout.write(
-            self.style.SUCCESS(f'Found {queryset.count()} API token(s):')
-        )
-        self.stdout.write('')
-
-        for token in queryset:
-            status = self.style.SUCCESS('ACTIVE') if token.is_active else self.style.ERROR('INACTIVE')
+        token_count = 0
+        for name, is_active, token, created_at, last_used_at in rows:
+            token_count += 1
+            status = self.style.SUCCESS('ACTIVE') if is_active else self.style.ERROR('INACTIVE')
             
-            self.stdout.write(f'Name: {token.name}')
+            self.stdout.write(f'Name: {name}')
             self.stdout.write(f'Status: {status}')
             
             if options['show_tokens']:
-                self.stdout.write(f'Token: {token.token}')
+                self.stdout.write(f'Token: {token}')
             else:
-                self.stdout.write(f'Token: {token.token[:8]}...{token.token[-4:]}')
+                self.stdout.write(f'Token: {token[:8]}...{token[-4:]}')
             
-            self.stdout.write(f'Created: {token.created_at}')
-            self.stdout.write(f'Last Used: {token.last_used_at or "Never"}')
-            self.stdout.write('-' * 50)
\ No newline at end of file
+            self.stdout.write(f'Created: {created_at}')
+            self.stdout.write(f'Last Used: {last_used_at or "Never"}')
+            self.stdout.write('-' * 50)
+
+        if not token_count:
+            self.stdout.write(
+                self.style.WARNING('No API tokens found')
+            )
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Found {token_count} API token(s)')
+        )
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.2 on 2026-10-14 17:20
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def deduplicate_token_names(apps, schema_editor):
+    """
+    Rename all but the oldest token of every duplicated name, so the unique
+    constraint can be added; the others get a " (2)", " (3)", ... suffix
+    """
+    ApiToken = apps.get_model('token_auth', 'ApiToken')
+    max_length = ApiToken._meta.get_field('name').max_length
+    taken = set(ApiToken.objects.values_list('name', flat=True))
+    duplicated = (
+        ApiToken.objects.values('name').annotate(count=Count('token')).filter(count__gt=1)
+        .values_list('name', flat=True)
+    )
+
+    for name in list(duplicated):
+        renamed = ApiToken.objects.filter(name=name).order_by('created_at', 'token')[1:]
+        number = 1
+        for token in list(renamed.values_list('token', flat=True)):
+            new_name = name
+            while new_name in taken:
+                number += 1
+                suffix = f" ({number})"
+                new_name = f"{name[:max_length - len(suffix)]}{suffix}"
+            taken.add(new_name)
+            ApiToken.objects.filter(token=token).update(name=new_name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('token_auth', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_token_names, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='apitoken',
+            name='name',
+            field=models.CharField(help_text='Token description', max_length=100, unique=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.2 on 2026-10-14 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('token_auth', '0002_unique_token_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apitoken',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['token'], name='apitoken_active_idx'),
+        ),
+    ]
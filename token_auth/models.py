@@ -1,5 +1,24 @@
+import hashlib
 import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class ApiTokenQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """Bulk updates send no post_save, so drop the cached validation of every affected token"""
+        if 'is_active' not in kwargs and 'token' not in kwargs:
+            return super().update(**kwargs)
+
+        tokens = list(self.values_list('token', flat=True))
+        rows = super().update(**kwargs)
+        cache.delete_many([ApiToken.cache_key(token) for token in tokens])
+        return rows
 
 
 class ApiToken(models.Model):
@@ -7,20 +26,71 @@ class ApiToken(models.Model):
     Simple API token model for authentication
     """
     token = models.CharField(max_length=64, unique=True, primary_key=True)
-    name = models.CharField(max_length=100, help_text="Token description")
+    name = models.CharField(max_length=100, unique=True, help_text="Token description")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     last_used_at = models.DateTimeField(null=True, blank=True)
 
+    objects = ApiTokenQuerySet.as_manager()
+
     class Meta:
         db_table = 'api_tokens'
         ordering = ['-created_at']
+        indexes = [
+            # Authentication only ever looks up active tokens
+            models.Index(fields=['token'], condition=Q(is_active=True), name='apitoken_active_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.token:
             self.token = self.generate_token()
+            # A freshly generated primary key cannot exist yet, so skip the UPDATE
+            # Django would otherwise try before inserting
+            kwargs.setdefault('force_insert', True)
         super().save(*args, **kwargs)
 
+    @classmethod
+    def is_active_token(cls, token: str) -> bool:
+        """
+        Check whether the token exists and is active
+
+        Positive results are cached for API_TOKEN_CACHE_TTL seconds, so authenticated
+        requests skip the database. Saving, deleting or bulk-updating a token drops its
+        entry. Only a shared cache (CACHE_REDIS_URL) stores entries, so a revocation
+        reaches every process; without one each request checks the database.
+        """
+        key = cls.cache_key(token)
+        if cache.get(key):
+            return True
+
+        is_active = cls.objects.filter(token=token, is_active=True).exists()
+        if is_active:
+            cache.set(key, True, settings.API_TOKEN_CACHE_TTL)
+        return is_active
+
+    @classmethod
+    def record_use(cls, token: str) -> None:
+        """
+        Update the token's last_used_at at most once per API_TOKEN_LAST_USED_INTERVAL seconds
+
+        cache.add() only succeeds for the first request of each interval, so a busy
+        token costs one UPDATE per interval rather than one per request. The UPDATE
+        also skips recently used tokens, which keeps the debounce when no cache is
+        configured. The queryset update sends no post_save, so the token's validation
+        cache entry stays valid.
+        """
+        interval = settings.API_TOKEN_LAST_USED_INTERVAL
+        if cache.add(f"{cls.cache_key(token)}:last_used", True, interval):
+            now = timezone.now()
+            cls.objects.filter(token=token).filter(
+                Q(last_used_at__isnull=True) | Q(last_used_at__lt=now - timedelta(seconds=interval))
+            ).update(last_used_at=now)
+
+    @staticmethod
+    def cache_key(token: str) -> str:
+        """Cache key for a token; hashed so raw tokens never reach the cache backend"""
+        return f"apitoken:{hashlib.sha256(token.encode()).hexdigest()}"
+
     @staticmethod
     def generate_token():
         """Generate secure random token"""
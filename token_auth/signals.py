@@ -0,0 +1,11 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ApiToken
+
+
+@receiver([post_save, post_delete], sender=ApiToken)
+def invalidate_cached_token(sender, instance, **kwargs):
+    """Deactivated or deleted tokens must stop authenticating immediately"""
+    cache.delete(ApiToken.cache_key(instance.token))
@@ -0,0 +1,117 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+from token_auth.models import ApiToken
+
+
+def migrate_token_auth(target):
+    """Migrate the token_auth app to target, returning the app registry of that state"""
+    executor = MigrationExecutor(connection)
+    executor.migrate([('token_auth', target)])
+    executor.loader.build_graph()
+    return executor.loader.project_state(('token_auth', target)).apps
+
+
+@pytest.mark.unit
+class TestApiToken:
+    """Test the token model"""
+
+    def test_new_token_is_inserted_without_update(self, db, django_assert_num_queries):
+        """Test that saving a token with a generated key issues a single INSERT"""
+        with django_assert_num_queries(1) as context:
+            token = ApiToken.objects.create(name='Insert only')
+
+        assert context.captured_queries[0]['sql'].startswith('INSERT')
+        assert len(token.token) > 32
+
+    def test_record_use_writes_once_per_interval(self, db, api_token, django_assert_num_queries):
+        """Test that repeated uses within the interval update last_used_at once"""
+        with django_assert_num_queries(1):
+            ApiToken.record_use(api_token.token)
+        api_token.refresh_from_db()
+        first_use = api_token.last_used_at
+        assert first_use is not None
+
+        with django_assert_num_queries(0):
+            ApiToken.record_use(api_token.token)
+
+    def test_record_use_debounces_without_cache(self, db, api_token, settings):
+        """Test that the UPDATE itself skips recently used tokens when nothing is cached"""
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        ApiToken.record_use(api_token.token)
+        api_token.refresh_from_db()
+        first_use = api_token.last_used_at
+
+        ApiToken.record_use(api_token.token)
+
+        api_token.refresh_from_db()
+        assert api_token.last_used_at == first_use
+
+
+@pytest.mark.unit
+class TestTokenCommands:
+    """Test the token management commands"""
+
+    def test_create_token(self, db):
+        """Test that a created token is printed in full"""
+        out = StringIO()
+        call_command('create_token', 'Importer', stdout=out)
+
+        token = ApiToken.objects.get(name='Importer')
+        assert f"Token: {token.token}" in out.getvalue()
+        assert token.is_active
+
+    def test_create_token_with_duplicate_name_fails(self, db, api_token):
+        """Test that the unique name constraint is reported as a command error"""
+        with pytest.raises(CommandError, match='Token with name "Test Token" already exists'):
+            call_command('create_token', 'Test Token', stdout=StringIO())
+
+        assert ApiToken.objects.filter(name='Test Token').count() == 1
+
+    def test_list_tokens_masks_values(self, db, api_token):
+        """Test that tokens are listed with masked values unless asked otherwise"""
+        inactive = ApiToken.objects.create(name='Retired', is_active=False)
+
+        out = StringIO()
+        call_command('list_tokens', stdout=out)
+        output = out.getvalue()
+
+        assert f"Token: {api_token.token[:8]}...{api_token.token[-4:]}" in output
+        assert api_token.token not in output
+        assert 'Found 2 API token(s)' in output
+
+        out = StringIO()
+        call_command('list_tokens', '--active-only', '--show-tokens', stdout=out)
+        output = out.getvalue()
+
+        assert f"Token: {api_token.token}" in output
+        assert inactive.token not in output
+        assert 'Found 1 API token(s)' in output
+
+
+@pytest.mark.integration
+class TestUniqueTokenNameMigration:
+    """Test the data migration that precedes the unique name constraint"""
+
+    def test_duplicate_names_get_numbered_suffixes(self, db):
+        """Test that all but the oldest token of a name are renamed around names already taken"""
+        old_apps = migrate_token_auth('0001_initial')
+        OldApiToken = old_apps.get_model('token_auth', 'ApiToken')
+        long_name = 'x' * 100
+        for token, name in [
+            ('a', 'Importer'), ('b', 'Importer'), ('c', 'Importer'), ('d', 'Importer (2)'),
+            ('e', long_name), ('f', long_name),
+        ]:
+            OldApiToken.objects.create(token=token, name=name)
+
+        migrate_token_auth('0002_unique_token_name')
+
+        names = dict(ApiToken.objects.values_list('token', 'name'))
+        assert names == {
+            'a': 'Importer', 'b': 'Importer (3)', 'c': 'Importer (4)', 'd': 'Importer (2)',
+            'e': long_name, 'f': 'x' * 96 + ' (2)',
+        }
@@ -49,7 +49,6 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'utils.middleware.ApiTokenAuthentication',
     'utils.middleware.RequestLoggingMiddleware',
     'utils.middleware.ErrorHandlingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -135,7 +134,12 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 # File uploads
-FILE_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
+# Uploads above 2.5MB are streamed to a temporary file while the request is read
+# instead of being held in memory. Keeping that file under MEDIA_ROOT lets
+# default_storage.save() move it into place with a rename instead of a copy.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5MB
+FILE_UPLOAD_TEMP_DIR = MEDIA_ROOT / 'tmp'
+FILE_UPLOAD_TEMP_DIR.mkdir(parents=True, exist_ok=True)
 DATA_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
 
 # Default primary key field type
@@ -143,11 +147,15 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'token_auth.authentication.ApiTokenAuthentication',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
+    # The browsable API renders a full HTML page per response; offer it only in development
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        'utils.renderers.ORJSONRenderer',
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -161,6 +169,40 @@ CURRENCY_EXCHANGE_RATES = {
     'PLN': 1.0,
 }
 
+# Serve unfiltered reports from materialized views refreshed after each CSV import
+REPORTS_USE_MATERIALIZED_VIEWS = os.getenv('REPORTS_USE_MATERIALIZED_VIEWS', 'False').lower() == 'true'
+
+# Identifies the deployed code; set it per release so cached reports and
+# ETags computed by the previous release are not served
+RELEASE_VERSION = os.getenv('RELEASE_VERSION', '')
+
+# Seconds a cached report is served before being recomputed
+REPORTS_CACHE_TTL = int(os.getenv('REPORTS_CACHE_TTL', 60))
+
+# Seconds a validated API token is trusted without re-checking the database
+API_TOKEN_CACHE_TTL = int(os.getenv('API_TOKEN_CACHE_TTL', 300))
+
+# Minimum seconds between last_used_at updates of the same API token
+API_TOKEN_LAST_USED_INTERVAL = int(os.getenv('API_TOKEN_LAST_USED_INTERVAL', 60))
+
+# Shared Redis cache when configured. Without one nothing is cached: a per-process
+# memory cache would never see invalidations made by the Celery worker or by
+# other web processes, and would keep serving stale reports and tokens
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        }
+    }
+
 # Celery Configuration
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
@@ -292,6 +334,10 @@ LOGGING = {
     },
 }
 
+# Loggers whose records are written by a background thread rather than the
+# logging caller; 'utils' carries the per-request middleware logs
+QUEUED_LOGGERS = ['utils']
+
 # Additional logging settings
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
 if LOG_LEVEL in ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']:
@@ -1,10 +1,32 @@
+from django import forms
 from django.contrib import admin
 
 from .models import Transaction
 
 
+class TransactionAdminForm(forms.ModelForm):
+    """Edit the amount in currency units; it is stored in cents through Transaction.amount"""
+    amount = forms.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        model = Transaction
+        exclude = ['amount_cents']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.amount_cents is not None:
+            self.initial.setdefault('amount', self.instance.amount)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('amount') is not None:
+            self.instance.amount = cleaned_data['amount']
+        return cleaned_data
+
+
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
+    form = TransactionAdminForm
     list_display = [
         'transaction_id',
         'timestamp',
@@ -19,6 +41,7 @@ class TransactionAdmin(admin.ModelAdmin):
     search_fields = ['transaction_id', 'customer_id', 'product_id']
     readonly_fields = ['transaction_id', 'created_at', 'updated_at']
     date_hierarchy = 'timestamp'
+    ordering = ['-timestamp']
 
     fieldsets = (
         ('Transaction Details', {
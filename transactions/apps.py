@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class TransactionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'transactions'
+
+    def ready(self):
+        from django.conf import settings
+
+        from utils.logging_utils import create_logs_directory, queue_logger_handlers
+        create_logs_directory()
+        for name in settings.QUEUED_LOGGERS:
+            queue_logger_handlers(name)
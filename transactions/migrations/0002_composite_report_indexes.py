@@ -0,0 +1,29 @@
+# Generated by Django 5.2.2 on 2026-10-14 17:02
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building the
+    # indexes this way keeps the transactions table writable during deploys
+    atomic = False
+
+    dependencies = [
+        ('transactions', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['customer_id', 'timestamp'], name='transaction_custome_620587_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['product_id', 'timestamp'], name='transaction_product_4ab43c_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['customer_id', 'product_id'], name='transaction_custome_dc7b98_idx'),
+        ),
+    ]
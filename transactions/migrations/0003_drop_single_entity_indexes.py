@@ -0,0 +1,24 @@
+# Generated by Django 5.2.2 on 2026-10-14 17:15
+
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # DROP INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('transactions', '0002_composite_report_indexes'),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name='transaction',
+            name='transaction_custome_72def0_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='transaction',
+            name='transaction_product_5e2c41_idx',
+        ),
+    ]
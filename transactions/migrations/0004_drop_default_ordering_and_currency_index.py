@@ -0,0 +1,24 @@
+# Generated by Django 5.2.2 on 2026-10-14 17:16
+
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # DROP INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('transactions', '0003_drop_single_entity_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='transaction',
+            options={},
+        ),
+        RemoveIndexConcurrently(
+            model_name='transaction',
+            name='transaction_currenc_cacf11_idx',
+        ),
+    ]
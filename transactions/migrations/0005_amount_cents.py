@@ -0,0 +1,34 @@
+# Generated by Django 5.2.2 on 2026-10-14 17:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0004_drop_default_ordering_and_currency_index'),
+    ]
+
+    operations = [
+        # amount is dropped by 0006; made nullable first so that reversing 0006
+        # can re-add the column empty and the backfill below refills it
+        migrations.AlterField(
+            model_name='transaction',
+            name='amount',
+            field=models.DecimalField(decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='amount_cents',
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.RunSQL(
+            sql='UPDATE transactions SET amount_cents = ROUND(amount * 100)::bigint;',
+            reverse_sql='UPDATE transactions SET amount = amount_cents / 100.0;',
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='amount_cents',
+            field=models.BigIntegerField(),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.2 on 2026-10-14 17:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0005_amount_cents'),
+        # The report materialized views must stop reading amount before it is dropped
+        ('reports', '0002_amount_cents_views'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='transaction',
+            name='amount',
+        ),
+    ]
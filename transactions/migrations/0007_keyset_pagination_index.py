@@ -0,0 +1,26 @@
+# Generated by Django 5.2.2 on 2026-10-14 17:33
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Concurrent index builds cannot run inside a transaction; the new index is
+    # built before the one it replaces is dropped, so timestamp filters never
+    # lose their index
+    atomic = False
+
+    dependencies = [
+        ('transactions', '0006_remove_transaction_amount'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['timestamp', 'transaction_id'], name='transaction_timesta_1f6f8b_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='transaction',
+            name='transaction_timesta_07633a_idx',
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.2 on 2026-10-14 17:45
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Concurrent index builds cannot run inside a transaction; the wider index is
+    # built before the one it supersedes is dropped
+    atomic = False
+
+    dependencies = [
+        ('transactions', '0007_keyset_pagination_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['customer_id', 'product_id', 'timestamp'], name='transaction_custome_697bca_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='transaction',
+            name='transaction_custome_dc7b98_idx',
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.2 on 2026-10-14 17:50
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Concurrent index builds cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('transactions', '0008_customer_product_timestamp_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['timestamp'], name='tx_ts_brin'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.2 on 2026-10-14 18:12
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0009_timestamp_brin_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='transaction',
+            name='amount_cents',
+            field=models.BigIntegerField(validators=[django.core.validators.MinValueValidator(-9999999999), django.core.validators.MaxValueValidator(9999999999)]),
+        ),
+    ]
@@ -1,12 +1,35 @@
 import uuid
+from decimal import ROUND_HALF_EVEN, Decimal
 
+from django.contrib.postgres.indexes import BrinIndex
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
+# amount used to be numeric(10, 2); amounts in cents keep its range of
+# absolute values below 10^8 currency units
+MAX_AMOUNT_CENTS = 10 ** 10
+
+
+def round_to_cents(amount) -> int:
+    """
+    Convert an amount in currency units to whole cents, rounding half to even as
+    the numeric(10, 2) column did
+
+    Every write path rounds through this, so the same input always stores the
+    same cents.
+    """
+    return int((Decimal(str(amount)) * 100).to_integral_value(rounding=ROUND_HALF_EVEN))
+
 
 class Transaction(models.Model):
     transaction_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     timestamp = models.DateTimeField()
-    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    # Stored as an integer number of cents (grosze) rather than numeric(10, 2);
+    # use the amount property for the value in currency units
+    amount_cents = models.BigIntegerField(validators=[
+        MinValueValidator(-MAX_AMOUNT_CENTS + 1),
+        MaxValueValidator(MAX_AMOUNT_CENTS - 1),
+    ])
     currency = models.CharField(max_length=3, choices=[
         ('PLN', 'Polish Złoty'),
         ('EUR', 'Euro'),
@@ -21,13 +44,43 @@ class Transaction(models.Model):
 
     class Meta:
         db_table = 'transactions'
-        ordering = ['-timestamp']
         indexes = [
-            models.Index(fields=['customer_id']),
-            models.Index(fields=['product_id']),
-            models.Index(fields=['timestamp']),
-            models.Index(fields=['currency']),
+            # Also the keyset for paginating listings newest first
+            models.Index(fields=['timestamp', 'transaction_id']),
+            # Report lookups filter by customer/product and a timestamp range; as the
+            # leftmost columns these also serve plain customer_id/product_id filters
+            models.Index(fields=['customer_id', 'timestamp']),
+            models.Index(fields=['product_id', 'timestamp']),
+            # Listings filtered by both ids come back newest first straight from the index
+            models.Index(fields=['customer_id', 'product_id', 'timestamp']),
+            # Unfiltered date-range reports read whole timestamp ranges; a BRIN index
+            # summarises them in a few pages and costs next to nothing on insert
+            BrinIndex(fields=['timestamp'], name='tx_ts_brin'),
         ]
 
+    @property
+    def amount(self):
+        """Amount in currency units, as a Decimal with two decimal places"""
+        if self.amount_cents is None:
+            return None
+        return Decimal(self.amount_cents).scaleb(-2)
+
+    @amount.setter
+    def amount(self, value):
+        self.amount_cents = None if value is None else self.to_cents(value)
+
+    @staticmethod
+    def to_cents(amount) -> int:
+        """
+        Convert an amount in currency units to whole cents with round_to_cents()
+
+        Raises:
+            ValueError: If the rounded amount is not below 10^8 in absolute value
+        """
+        cents = round_to_cents(amount)
+        if abs(cents) >= MAX_AMOUNT_CENTS:
+            raise ValueError(f"amount must be less than {MAX_AMOUNT_CENTS // 100} in absolute value: {amount}")
+        return cents
+
     def __str__(self):
         return f"Transaction {self.transaction_id} - {self.amount} {self.currency}"
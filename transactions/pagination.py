@@ -0,0 +1,14 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TransactionCursorPagination(CursorPagination):
+    """
+    Keyset pagination for transaction listings, newest first
+
+    Each page filters on the last seen timestamp instead of skipping rows with
+    OFFSET, so deep pages cost the same as the first one. transaction_id breaks
+    ties between transactions sharing a timestamp.
+    """
+    ordering = ('-timestamp', '-transaction_id')
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
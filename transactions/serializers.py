@@ -2,8 +2,13 @@ from rest_framework import serializers
 
 from .models import Transaction
 
+# Formats datetimes exactly like the serializer's DateTimeFields would
+_DATETIME_FIELD = serializers.DateTimeField()
+
 
 class TransactionSerializer(serializers.ModelSerializer):
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+
     class Meta:
         model = Transaction
         fields = [
@@ -18,3 +23,25 @@ class TransactionSerializer(serializers.ModelSerializer):
             'updated_at'
         ]
         read_only_fields = ['transaction_id', 'created_at', 'updated_at']
+
+    def to_representation(self, instance):
+        """
+        Build the response dict directly from the instance
+
+        Produces the same output as the declared fields without running DRF's
+        per-field loop for every row of a listing page.
+        """
+        to_datetime = _DATETIME_FIELD.to_representation
+        amount = instance.amount
+        return {
+            'transaction_id': str(instance.transaction_id),
+            'timestamp': to_datetime(instance.timestamp),
+            # amount always carries exactly two decimal places
+            'amount': None if amount is None else str(amount),
+            'currency': instance.currency,
+            'customer_id': str(instance.customer_id),
+            'product_id': str(instance.product_id),
+            'quantity': instance.quantity,
+            'created_at': to_datetime(instance.created_at),
+            'updated_at': to_datetime(instance.updated_at),
+        }
@@ -1,136 +1,343 @@
+import csv
+import io
 import logging
-import uuid
+import re
 
+import numpy as np
 import pandas as pd
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
 
-from ..models import Transaction
+from ..models import MAX_AMOUNT_CENTS, Transaction, round_to_cents
 
 logger = logging.getLogger(__name__)
 
+# A UUID's 32 hex digits once the urn/uuid prefixes, braces and hyphens are stripped
+_UUID_HEX_RE = re.compile(r'[0-9a-fA-F]{32}', re.ASCII)
 
-class CSVProcessor:
-    REQUIRED_COLUMNS = [
-        'transaction_id', 'timestamp', 'amount', 'currency',
-        'customer_id', 'product_id', 'quantity'
-    ]
+# Sets, since both are only used for membership tests and set differences
+_REQUIRED_COLUMNS = frozenset((
+    'transaction_id', 'timestamp', 'amount', 'currency',
+    'customer_id', 'product_id', 'quantity'
+))
+
+_VALID_CURRENCIES = frozenset(('PLN', 'EUR', 'USD'))
+_VALID_CURRENCIES_MESSAGE = f"Must be one of {sorted(_VALID_CURRENCIES)}"
+
+# Largest value of the integer column behind Transaction.quantity
+_MAX_QUANTITY = 2 ** 31 - 1
+
+# Integer literals as int() accepts them
+_INTEGER_PATTERN = r'[+-]?\d+'
 
-    VALID_CURRENCIES = ['PLN', 'EUR', 'USD']
+# Amounts with at most two decimal places, which float arithmetic converts to cents exactly
+_CENT_AMOUNT_PATTERN = r'\s*[+-]?(?:\d+\.?\d{0,2}|\.\d{1,2})\s*'
+
+
+class CSVProcessor:
+    # Validated rows are written once this many are pending
+    BATCH_SIZE = 10_000
+    # Rows per INSERT statement issued by bulk_create
+    INSERT_BATCH_SIZE = 1000
+    # Error messages included in the rejected rows warning
+    LOGGED_ERRORS_LIMIT = 10
 
     def process_file(self, uploaded_file):
         """Process uploaded CSV file and return results"""
         try:
-            df = pd.read_csv(uploaded_file)
-            self._validate_columns(df)
-
-            successful_transactions = []
-            errors = []
-
-            for index, row in df.iterrows():
-                try:
-                    transaction_data = self._validate_row(row, index)
-                    transaction = Transaction.objects.create(**transaction_data)
-                    successful_transactions.append(transaction.transaction_id)
-                    logger.info(f"Created transaction: {transaction.transaction_id}")
-                except ValidationError as e:
-                    error_msg = f"Row {index + 1}: {str(e)}"
-                    errors.append(error_msg)
-                    logger.warning(error_msg)
-                except Exception as e:
-                    error_msg = f"Row {index + 1}: Unexpected error - {str(e)}"
-                    errors.append(error_msg)
-                    logger.error(error_msg)
-
-            return {
-                'message': 'File processed successfully',
-                'total_rows': len(df),
-                'successful_transactions': len(successful_transactions),
-                'failed_rows': len(errors),
-                'errors': errors,
-                'created_transactions': successful_transactions
-            }
+            return self.process_frame(self.read_csv(uploaded_file))
 
         except Exception as e:
             logger.error(f"Failed to process CSV file: {str(e)}")
             raise Exception(f"Failed to process CSV file: {str(e)}")
 
-    def _validate_columns(self, df):
-        """Validate that all required columns are present"""
-        missing_columns = set(self.REQUIRED_COLUMNS) - set(df.columns)
-        if missing_columns:
-            raise ValidationError(f"Missing required columns: {', '.join(missing_columns)}")
+    def read_csv(self, source, chunksize=None):
+        """
+        Read the required columns of a CSV file as plain strings
 
-    def _validate_row(self, row, row_index):
-        """Validate and process a single row of data"""
-        try:
-            transaction_id = self._validate_uuid(row['transaction_id'], 'transaction_id')
-            timestamp = self._validate_timestamp(row['timestamp'])
-            amount = self._validate_amount(row['amount'])
-            currency = self._validate_currency(row['currency'])
-            customer_id = self._validate_uuid(row['customer_id'], 'customer_id')
-            product_id = self._validate_uuid(row['product_id'], 'product_id')
-            quantity = self._validate_quantity(row['quantity'])
-
-            return {
-                'transaction_id': transaction_id,
-                'timestamp': timestamp,
-                'amount': amount,
-                'currency': currency,
-                'customer_id': customer_id,
-                'product_id': product_id,
-                'quantity': quantity
+        The column validators do all type conversion, so pandas' per-column type
+        inference is wasted. With chunksize, returns an iterator of DataFrames
+        whose row index continues across chunks.
+        """
+        return pd.read_csv(
+            source,
+            dtype=str,
+            usecols=lambda column: column in _REQUIRED_COLUMNS,
+            chunksize=chunksize
+        )
+
+    def iter_chunks(self, source, chunksize=BATCH_SIZE):
+        """Yield the CSV file in DataFrames of at most chunksize rows, checking their columns"""
+        for chunk in self.read_csv(source, chunksize=chunksize):
+            self._validate_columns(chunk)
+            yield chunk
+
+    def process_frame(self, df):
+        """
+        Validate and store the rows of a DataFrame read by read_csv()
+
+        Error messages number rows by the DataFrame index, so a chunk of a larger
+        file reports the rows' positions within the whole file.
+        """
+        self._validate_columns(df)
+
+        valid_rows, row_errors = self._validate_frame(df)
+
+        successful_transactions = []
+        # Prefix all validation errors with their row numbers in one vectorized step
+        errors = ("Row " + (row_errors.index + 1).astype(str) + ": " + row_errors).tolist()
+
+        seen_transaction_ids = set()
+        # transaction_id -> (row number, unsaved Transaction)
+        pending = {}
+
+        # Commit all batches together; each batch runs in a savepoint, so a failed
+        # insert only rolls back its own batch
+        with transaction.atomic():
+            for row in valid_rows.itertuples():
+                if row.transaction_id in seen_transaction_ids:
+                    errors.append(f"Row {row.Index + 1}: Duplicate transaction_id in file: {row.transaction_id}")
+                    continue
+                seen_transaction_ids.add(row.transaction_id)
+
+                pending[row.transaction_id] = (row.Index + 1, Transaction(
+                    transaction_id=row.transaction_id,
+                    timestamp=row.timestamp.to_pydatetime(),
+                    amount_cents=int(row.amount),  # parsed amounts are in cents
+                    currency=row.currency,
+                    customer_id=row.customer_id,
+                    product_id=row.product_id,
+                    quantity=int(row.quantity)
+                ))
+                if len(pending) >= self.BATCH_SIZE:
+                    successful_transactions.extend(self._save_batch(pending, errors))
+                    pending = {}
+
+            if pending:
+                successful_transactions.extend(self._save_batch(pending, errors))
+
+        # Log once per file instead of once per row; the result carries every error
+        logger.info("Created %d transactions from file (failed: %d)", len(successful_transactions), len(errors))
+        if errors:
+            logger.warning(
+                "Rejected %d of %d rows, first errors: %s",
+                len(errors), len(df), errors[:self.LOGGED_ERRORS_LIMIT]
+            )
+
+        return {
+            'message': 'File processed successfully',
+            'total_rows': len(df),
+            'successful_transactions': len(successful_transactions),
+            'failed_rows': len(errors),
+            'errors': errors,
+            'created_transactions': successful_transactions
+        }
+
+    def _validate_frame(self, df):
+        """
+        Validate all rows column by column instead of row by row
+
+        Returns:
+            tuple: DataFrame of parsed values for the valid rows, and a Series with
+            the first validation error of every invalid row, both indexed by row
+        """
+        column_validators = [
+            ('transaction_id', self._validate_uuid_column),
+            ('timestamp', self._validate_timestamp_column),
+            ('amount', self._validate_amount_column),
+            ('currency', self._validate_currency_column),
+            ('customer_id', self._validate_uuid_column),
+            ('product_id', self._validate_uuid_column),
+            ('quantity', self._validate_quantity_column),
+        ]
+
+        parsed = {}
+        errors = pd.Series(None, index=df.index, dtype=object)
+        for column, validator in column_validators:
+            parsed[column], column_errors = validator(df[column], column)
+            # Keep the first error found for each row
+            errors = errors.where(errors.notna(), column_errors)
+
+        invalid = errors.notna()
+        return pd.DataFrame(parsed)[~invalid], errors[invalid]
+
+    @staticmethod
+    def _column_errors(index, *checks):
+        """Build a Series of error messages from (mask, message) pairs, earlier checks winning"""
+        errors = pd.Series(None, index=index, dtype=object)
+        for mask, message in reversed(checks):
+            errors[mask] = message[mask] if isinstance(message, pd.Series) else message
+        return errors
+
+    def _validate_uuid_column(self, values, field_name):
+        """Validate a UUID column, accepting the same spellings as uuid.UUID()"""
+        text = values.astype('string')
+        hex_digits = (
+            text.str.replace('urn:', '', regex=False)
+            .str.replace('uuid:', '', regex=False)
+            .str.strip('{}')
+            .str.replace('-', '', regex=False)
+        )
+        missing = values.isna()
+        well_formed = hex_digits.str.fullmatch(_UUID_HEX_RE).fillna(False).astype(bool)
+
+        errors = self._column_errors(
+            values.index,
+            (missing, f"{field_name} is required"),
+            (~well_formed, f"Invalid UUID format for {field_name}: " + text.astype(object).astype(str)),
+        )
+        return self._canonical_uuids(hex_digits[well_formed]), errors
+
+    @staticmethod
+    def _canonical_uuids(hex_digits):
+        """
+        Format 32-digit hex strings as canonical lowercase UUID strings
+
+        Slicing the whole column avoids constructing a uuid.UUID per value;
+        UUIDField accepts the strings as they are.
+        """
+        digits = hex_digits.str.lower()
+        return (
+            digits.str[0:8] + '-' + digits.str[8:12] + '-' + digits.str[12:16] + '-'
+            + digits.str[16:20] + '-' + digits.str[20:32]
+        ).astype(object)
+
+    def _validate_timestamp_column(self, values, field_name):
+        """Validate an ISO 8601 timestamp column; naive timestamps are taken as UTC"""
+        missing = values.isna()
+        timestamps = pd.to_datetime(values.astype('string'), format='ISO8601', errors='coerce', utc=True)
+
+        errors = self._column_errors(
+            values.index,
+            (missing, "timestamp is required"),
+            (timestamps.isna(), "Invalid timestamp format: " + values.astype(str)),
+        )
+        return timestamps, errors
+
+    def _validate_amount_column(self, values, field_name):
+        """
+        Validate that every amount is a positive number below 10^8, returning
+        amounts in whole cents
+        """
+        missing = values.isna()
+        amounts = pd.to_numeric(values, errors='coerce')
+        cents = (amounts * 100).round()
+        # Floats are exact to the cent for at most two decimal places; round any
+        # finer amounts from their text, exactly as the model does
+        sub_cent = np.isfinite(amounts) & ~values.astype(str).str.fullmatch(_CENT_AMOUNT_PATTERN)
+        if sub_cent.any():
+            cents[sub_cent] = values[sub_cent].map(round_to_cents)
+
+        errors = self._column_errors(
+            values.index,
+            (missing, "amount is required"),
+            (~np.isfinite(amounts), "Invalid amount format: " + values.astype(str)),
+            (amounts <= 0, "amount must be positive: " + amounts.astype(str)),
+            (cents >= MAX_AMOUNT_CENTS,
+             f"amount must be less than {MAX_AMOUNT_CENTS // 100}: " + values.astype(str)),
+        )
+        return cents, errors
+
+    def _validate_currency_column(self, values, field_name):
+        """Validate currency codes case-insensitively"""
+        missing = values.isna()
+        currencies = values.astype(str).str.upper()
+
+        errors = self._column_errors(
+            values.index,
+            (missing, "currency is required"),
+            (~currencies.isin(_VALID_CURRENCIES),
+             "Invalid currency: " + currencies + f". {_VALID_CURRENCIES_MESSAGE}"),
+        )
+        return currencies, errors
+
+    def _validate_quantity_column(self, values, field_name):
+        """
+        Validate that every quantity is a positive integer that fits the quantity
+        column; like int(), only integer literals are accepted, not '1.0' or '1e3'
+        """
+        missing = values.isna()
+        text = values.astype(str).str.strip()
+        well_formed = text.str.fullmatch(_INTEGER_PATTERN)
+        quantities = pd.to_numeric(values.where(well_formed), errors='coerce')
+
+        errors = self._column_errors(
+            values.index,
+            (missing, "quantity is required"),
+            (~well_formed, "Invalid quantity format: " + values.astype(str)),
+            (quantities <= 0, "quantity must be positive: " + text),
+            (quantities > _MAX_QUANTITY, f"quantity must be at most {_MAX_QUANTITY}: " + values.astype(str)),
+        )
+        return quantities, errors
+
+    def _save_batch(self, pending, errors):
+        """
+        Insert a batch of validated transactions with bulk_create
+
+        Rows whose transaction_id is already stored are reported in errors instead
+        of failing the whole batch. Returns the ids of the created transactions.
+        """
+        while True:
+            # pending is keyed by canonical UUID strings, the database returns UUIDs
+            existing_ids = {
+                str(transaction_id) for transaction_id in
+                Transaction.objects.filter(transaction_id__in=list(pending))
+                .values_list('transaction_id', flat=True)
             }
+            new_transactions = [
+                new_transaction for transaction_id, (_, new_transaction) in pending.items()
+                if transaction_id not in existing_ids
+            ]
+            try:
+                with transaction.atomic():
+                    if connection.vendor == 'postgresql':
+                        self._copy_insert(new_transactions)
+                    else:
+                        Transaction.objects.bulk_create(new_transactions, batch_size=self.INSERT_BATCH_SIZE)
+                break
+            except IntegrityError:
+                # A chunk of the same file processed in parallel may have stored some
+                # of these ids since the check above; re-check unless none appeared
+                if not Transaction.objects.filter(
+                    transaction_id__in=[new_transaction.transaction_id for new_transaction in new_transactions]
+                ).exists():
+                    raise
 
-        except Exception as e:
-            raise ValidationError(f"Invalid data: {str(e)}")
+        errors.extend(
+            f"Row {pending[transaction_id][0]}: Transaction {transaction_id} already exists"
+            for transaction_id in existing_ids
+        )
 
-    def _validate_uuid(self, value, field_name):
-        """Validate UUID format"""
-        try:
-            if pd.isna(value):
-                raise ValidationError(f"{field_name} is required")
-            return uuid.UUID(str(value))
-        except (ValueError, TypeError):
-            raise ValidationError(f"Invalid UUID format for {field_name}: {value}")
-
-    def _validate_timestamp(self, value):
-        """Validate ISO 8601 timestamp"""
-        try:
-            if pd.isna(value):
-                raise ValidationError("timestamp is required")
-            return pd.to_datetime(value, format='ISO8601')
-        except (ValueError, TypeError):
-            raise ValidationError(f"Invalid timestamp format: {value}")
-
-    def _validate_amount(self, value):
-        """Validate amount is a positive number"""
-        try:
-            if pd.isna(value):
-                raise ValidationError("amount is required")
-            amount = float(value)
-            if amount <= 0:
-                raise ValidationError(f"amount must be positive: {amount}")
-            return amount
-        except (ValueError, TypeError):
-            raise ValidationError(f"Invalid amount format: {value}")
-
-    def _validate_currency(self, value):
-        """Validate currency code"""
-        if pd.isna(value):
-            raise ValidationError("currency is required")
-        currency = str(value).upper()
-        if currency not in self.VALID_CURRENCIES:
-            raise ValidationError(f"Invalid currency: {currency}. Must be one of {self.VALID_CURRENCIES}")
-        return currency
-
-    def _validate_quantity(self, value):
-        """Validate quantity is a positive integer"""
-        try:
-            if pd.isna(value):
-                raise ValidationError("quantity is required")
-            quantity = int(value)
-            if quantity <= 0:
-                raise ValidationError(f"quantity must be positive: {quantity}")
-            return quantity
-        except (ValueError, TypeError):
-            raise ValidationError(f"Invalid quantity format: {value}")
\ No newline at end of file
+        logger.debug("Created %d transactions in batch", len(new_transactions))
+        return [new_transaction.transaction_id for new_transaction in new_transactions]
+
+    def _copy_insert(self, new_transactions):
+        """
+        Stream transactions into PostgreSQL with COPY FROM STDIN
+
+        Values go through each field's pre_save()/get_db_prep_save(), like
+        bulk_create, so auto timestamps and decimal rounding are identical.
+        """
+        fields = Transaction._meta.concrete_fields
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for new_transaction in new_transactions:
+            writer.writerow([
+                field.get_db_prep_save(field.pre_save(new_transaction, True), connection)
+                for field in fields
+            ])
+        buffer.seek(0)
+
+        quote_name = connection.ops.quote_name
+        columns = ', '.join(quote_name(field.column) for field in fields)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {quote_name(Transaction._meta.db_table)} ({columns}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+
+    def _validate_columns(self, df):
+        """Validate that all required columns are present"""
+        missing_columns = _REQUIRED_COLUMNS.difference(df.columns)
+        if missing_columns:
+            raise ValidationError(f"Missing required columns: {', '.join(missing_columns)}")
@@ -6,18 +6,18 @@ class TransactionService:
 
     @staticmethod
     def get_transactions_by_customer(customer_id):
-        """Get all transactions for a specific customer"""
-        return Transaction.objects.filter(customer_id=customer_id)
+        """Get all transactions for a specific customer, newest first"""
+        return Transaction.objects.filter(customer_id=customer_id).order_by('-timestamp')
 
     @staticmethod
     def get_transactions_by_product(product_id):
-        """Get all transactions for a specific product"""
-        return Transaction.objects.filter(product_id=product_id)
+        """Get all transactions for a specific product, newest first"""
+        return Transaction.objects.filter(product_id=product_id).order_by('-timestamp')
 
     @staticmethod
     def filter_transactions(customer_id=None, product_id=None):
-        """Filter transactions by customer and/or product"""
-        queryset = Transaction.objects.all()
+        """Filter transactions by customer and/or product, newest first"""
+        queryset = Transaction.objects.order_by('-timestamp', '-transaction_id')
 
         if customer_id:
             queryset = queryset.filter(customer_id=customer_id)
@@ -1,6 +1,12 @@
+import io
 import logging
-from celery import shared_task
+from celery import chord, shared_task
+from django.conf import settings
 from django.core.files.storage import default_storage
+from django.db import transaction
+
+from reports.services.report_service import invalidate_cached_reports
+from reports.tasks import refresh_report_views
 from .services.csv_processor import CSVProcessor
 
 logger = logging.getLogger(__name__)
@@ -10,17 +16,80 @@ logger = logging.getLogger(__name__)
 def process_csv_file_async(self, file_path):
     """
     Asynchronous task to process CSV file
+
+    The file is split into chunks of CSVProcessor.BATCH_SIZE rows, validated and
+    inserted in parallel by process_csv_chunk tasks. This task is replaced by a
+    chord over the chunks, so its result is the one built by merge_csv_results.
     """
     try:
         logger.info(f"Starting async CSV processing for file: {file_path}")
         
         with default_storage.open(file_path, 'rb') as file:
             processor = CSVProcessor()
-            result = processor.process_file(file)
+            chunk_tasks = [
+                process_csv_chunk.s(chunk.to_csv(index=False), chunk.index.start)
+                for chunk in processor.iter_chunks(file)
+            ]
             
-        logger.info(f"Completed async CSV processing for file: {file_path}")
-        return result
+        logger.info(f"Dispatching {len(chunk_tasks)} chunk(s) of CSV file: {file_path}")
         
     except Exception as e:
         logger.error(f"Error processing CSV file {file_path}: {str(e)}")
-        raise self.retry(exc=e, countdown=60, max_retries=3)
\ No newline at end of file
+        raise self.retry(exc=e, countdown=60, max_retries=3)
+
+    if not chunk_tasks:
+        return merge_csv_results([])
+
+    merge = merge_csv_results.s()
+    if settings.REPORTS_USE_MATERIALIZED_VIEWS:
+        # A failed chunk skips merge_csv_results, but the committed chunks still
+        # have to reach the materialized views
+        merge = merge.on_error(refresh_report_views.si())
+    return self.replace(chord(chunk_tasks, merge))
+
+
+@shared_task
+def process_csv_chunk(csv_text, first_index):
+    """
+    Validate and insert one chunk of an uploaded CSV file
+
+    first_index is the chunk's row offset in the file, so error messages keep
+    numbering rows relative to the whole file. Cached reports are invalidated
+    as soon as the chunk's rows are committed: if another chunk fails, Celery
+    never runs merge_csv_results, and the stored rows must not stay hidden
+    behind cached reports and ETags.
+    """
+    processor = CSVProcessor()
+    df = processor.read_csv(io.StringIO(csv_text))
+    df.index += first_index
+    result = processor.process_frame(df)
+
+    if result['created_transactions']:
+        transaction.on_commit(invalidate_cached_reports)
+    return result
+
+
+@shared_task
+def merge_csv_results(results):
+    """Combine the results of all chunks of a file and refresh reports once for them"""
+    errors = [error for result in results for error in result['errors']]
+    created_transactions = [
+        transaction_id for result in results for transaction_id in result['created_transactions']
+    ]
+    merged = {
+        'message': 'File processed successfully',
+        'total_rows': sum(result['total_rows'] for result in results),
+        'successful_transactions': len(created_transactions),
+        'failed_rows': len(errors),
+        'errors': errors,
+        'created_transactions': created_transactions
+    }
+
+    # Each chunk already invalidated cached reports; the views are refreshed once
+    # every chunk is stored, so a refresh failure never re-imports the file.
+    # When a chunk fails, the errback set up by process_csv_file_async refreshes them
+    if created_transactions and settings.REPORTS_USE_MATERIALIZED_VIEWS:
+        refresh_report_views.delay()
+
+    logger.info(f"Completed async CSV processing: {merged['successful_transactions']} of {merged['total_rows']} rows imported")
+    return merged
@@ -1,11 +1,21 @@
 import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
 from io import StringIO
 
+import pandas as pd
 import pytest
-from django.core.exceptions import ValidationError
 
+from reports.services.report_service import get_report_version
 from transactions.models import Transaction
 from transactions.services.csv_processor import CSVProcessor
+from transactions.tasks import merge_csv_results, process_csv_chunk
+
+
+def validate_column(validator, values):
+    """Run a column validator over values, returning its parsed values and per-row errors (None when valid)"""
+    parsed, errors = validator(pd.Series(values, dtype=object), 'test_field')
+    return parsed, errors.astype(object).where(errors.notna(), None).tolist()
 
 
 @pytest.mark.unit
@@ -43,36 +53,21 @@ class TestCSVProcessor:
 
     def test_validate_uuid_field(self):
         """Test UUID validation"""
-        processor = CSVProcessor()
-
-        # Valid UUID
-        valid_uuid = processor._validate_uuid('550e8400-e29b-41d4-a716-446655440000', 'test_field')
-        assert isinstance(valid_uuid, uuid.UUID)
+        uuids, errors = validate_column(
+            CSVProcessor()._validate_uuid_column,
+            ['550e8400-E29B-41d4-a716-446655440000', 'invalid-uuid', None]
+        )
 
-        # Invalid UUID format
-        with pytest.raises(ValidationError, match="Invalid UUID format"):
-            processor._validate_uuid('invalid-uuid', 'test_field')
-
-        # Empty/None UUID
-        with pytest.raises(ValidationError, match="test_field is required"):
-            processor._validate_uuid(None, 'test_field')
+        assert uuids.tolist() == ['550e8400-e29b-41d4-a716-446655440000']
+        assert errors == [None, "Invalid UUID format for test_field: invalid-uuid", "test_field is required"]
 
     def test_validate_timestamp(self):
         """Test timestamp validation"""
-        processor = CSVProcessor()
-
-        # Valid ISO 8601 timestamps
         valid_timestamps = [
             '2024-01-15T10:30:00Z',
             '2024-01-15T10:30:00.123Z',
             '2024-01-15T10:30:00+02:00'
         ]
-
-        for timestamp_str in valid_timestamps:
-            result = processor._validate_timestamp(timestamp_str)
-            assert result is not None
-
-        # Invalid timestamp formats
         invalid_timestamps = [
             'not-a-date',
             'invalid-timestamp',
@@ -80,75 +75,75 @@ class TestCSVProcessor:
             None
         ]
 
-        for invalid_timestamp in invalid_timestamps:
-            with pytest.raises(ValidationError):
-                processor._validate_timestamp(invalid_timestamp)
+        timestamps, errors = validate_column(
+            CSVProcessor()._validate_timestamp_column, valid_timestamps + invalid_timestamps
+        )
+
+        assert timestamps[2] == datetime(2024, 1, 15, 8, 30, tzinfo=timezone.utc)
+        assert errors[:3] == [None] * 3
+        assert errors[3:] == [
+            "Invalid timestamp format: not-a-date",
+            "Invalid timestamp format: invalid-timestamp",
+            "Invalid timestamp format: 123456",
+            "timestamp is required",
+        ]
 
     def test_validate_amount(self):
         """Test amount validation"""
-        processor = CSVProcessor()
+        cents, errors = validate_column(
+            CSVProcessor()._validate_amount_column,
+            ['99.99', 100, '0.01', '-10.00', '0', 'not-a-number', None, '100000000']
+        )
 
-        # Valid amounts
-        assert processor._validate_amount('99.99') == 99.99
-        assert processor._validate_amount(100) == 100.0
-        assert processor._validate_amount('0.01') == 0.01
+        # Valid amounts, in cents
+        assert cents[:3].tolist() == [9999, 10000, 1]
+        assert errors[:3] == [None] * 3
 
         # Invalid amounts
-        with pytest.raises(ValidationError, match="amount must be positive"):
-            processor._validate_amount('-10.00')
-
-        with pytest.raises(ValidationError, match="amount must be positive"):
-            processor._validate_amount('0')
-
-        with pytest.raises(ValidationError, match="Invalid amount format"):
-            processor._validate_amount('not-a-number')
-
-        with pytest.raises(ValidationError, match="amount is required"):
-            processor._validate_amount(None)
+        assert errors[3:] == [
+            "amount must be positive: -10.0",
+            "amount must be positive: 0.0",
+            "Invalid amount format: not-a-number",
+            "amount is required",
+            "amount must be less than 100000000: 100000000",
+        ]
 
     def test_validate_currency(self):
         """Test currency validation"""
-        processor = CSVProcessor()
+        currencies, errors = validate_column(
+            CSVProcessor()._validate_currency_column, ['PLN', 'EUR', 'USD', 'pln', 'eur', 'GBP', None]
+        )
 
-        # Valid currencies
-        for currency in ['PLN', 'EUR', 'USD']:
-            assert processor._validate_currency(currency) == currency
-
-        # Test case insensitive
-        assert processor._validate_currency('pln') == 'PLN'
-        assert processor._validate_currency('eur') == 'EUR'
+        # Valid currencies, case insensitive
+        assert currencies[:5].tolist() == ['PLN', 'EUR', 'USD', 'PLN', 'EUR']
+        assert errors[:5] == [None] * 5
 
         # Invalid currencies
-        with pytest.raises(ValidationError, match="Invalid currency"):
-            processor._validate_currency('GBP')
-
-        with pytest.raises(ValidationError, match="currency is required"):
-            processor._validate_currency(None)
+        assert errors[5].startswith("Invalid currency: GBP")
+        assert errors[6] == "currency is required"
 
     def test_validate_quantity(self):
         """Test quantity validation"""
-        processor = CSVProcessor()
+        quantities, errors = validate_column(
+            CSVProcessor()._validate_quantity_column,
+            ['5', 10, '1', '-1', '0', '1.5', '1.0', '1e3', 'not-a-number', None, '99999999999']
+        )
 
         # Valid quantities
-        assert processor._validate_quantity('5') == 5
-        assert processor._validate_quantity(10) == 10
-        assert processor._validate_quantity('1') == 1
-
-        # Invalid quantities
-        with pytest.raises(ValidationError, match="quantity must be positive"):
-            processor._validate_quantity('-1')
-
-        with pytest.raises(ValidationError, match="quantity must be positive"):
-            processor._validate_quantity('0')
-
-        with pytest.raises(ValidationError, match="Invalid quantity format"):
-            processor._validate_quantity('1.5')  # Not an integer
-
-        with pytest.raises(ValidationError, match="Invalid quantity format"):
-            processor._validate_quantity('not-a-number')
-
-        with pytest.raises(ValidationError, match="quantity is required"):
-            processor._validate_quantity(None)
+        assert quantities[:3].tolist() == [5, 10, 1]
+        assert errors[:3] == [None] * 3
+
+        # Invalid quantities; like int(), only integer literals are accepted
+        assert errors[3:] == [
+            "quantity must be positive: -1",
+            "quantity must be positive: 0",
+            "Invalid quantity format: 1.5",
+            "Invalid quantity format: 1.0",
+            "Invalid quantity format: 1e3",
+            "Invalid quantity format: not-a-number",
+            "quantity is required",
+            "quantity must be at most 2147483647: 99999999999",
+        ]
 
     def test_missing_required_columns(self, db):
         """Test handling of missing required columns"""
@@ -189,4 +184,115 @@ f47ac10b-58cc-4372-a567-0e02b2c3d480,2024-01-15T14:22:15Z,149.50,EUR,550e8400-e2
         assert len(result['created_transactions']) == 2
 
         # Verify successful transactions were created
-        assert Transaction.objects.count() == 2
\ No newline at end of file
+        assert Transaction.objects.count() == 2
+
+    def test_amount_above_former_decimal_range_fails_its_row(self, db):
+        """Test that amounts of 10^8 or more are rejected per row, as numeric(10, 2) did"""
+        csv_content = """transaction_id,timestamp,amount,currency,customer_id,product_id,quantity
+f47ac10b-58cc-4372-a567-0e02b2c3d479,2024-01-15T10:30:00Z,99999999.99,PLN,550e8400-e29b-41d4-a716-446655440001,6ba7b810-9dad-11d1-80b4-00c04fd430c8,2
+f47ac10b-58cc-4372-a567-0e02b2c3d480,2024-01-15T10:30:00Z,99999999999.99,PLN,550e8400-e29b-41d4-a716-446655440001,6ba7b810-9dad-11d1-80b4-00c04fd430c8,2"""
+
+        result = CSVProcessor().process_file(StringIO(csv_content))
+
+        assert result['successful_transactions'] == 1
+        assert result['errors'] == ["Row 2: amount must be less than 100000000: 99999999999.99"]
+        assert Transaction.objects.get().amount == Decimal('99999999.99')
+
+    @pytest.mark.parametrize('amount, quantity, expected_error', [
+        ('inf', '2', "Invalid amount format: inf"),
+        ('1e20', '2', "amount must be less than 100000000: 1e20"),
+        ('99.99', '99999999999', "quantity must be at most 2147483647: 99999999999"),
+    ])
+    def test_values_outside_column_ranges_fail_only_their_row(self, db, amount, quantity, expected_error):
+        """Test that non-finite or oversized values are reported per row while other rows import"""
+        rows = [
+            f"{uuid.uuid4()},2024-01-15T10:30:00Z,{row_amount},PLN,{uuid.uuid4()},{uuid.uuid4()},{row_quantity}"
+            for row_amount, row_quantity in [('10.00', '1'), (amount, quantity), ('20.00', '3')]
+        ]
+        csv_content = "\n".join(["transaction_id,timestamp,amount,currency,customer_id,product_id,quantity", *rows])
+
+        result = CSVProcessor().process_file(StringIO(csv_content))
+
+        assert result['successful_transactions'] == 2
+        assert result['errors'] == [f"Row 2: {expected_error}"]
+        assert Transaction.objects.count() == 2
+
+    @pytest.mark.parametrize('amount, expected', [
+        ('0.125', Decimal('0.12')),
+        ('1.005', Decimal('1.00')),
+        ('0.285', Decimal('0.28')),
+        ('2.675', Decimal('2.68')),
+        ('1e2', Decimal('100.00')),
+    ])
+    def test_sub_cent_amounts_round_like_the_model(self, db, amount, expected):
+        """Test that CSV imports and model writes round sub-cent amounts half to even alike"""
+        csv_content = "\n".join([
+            "transaction_id,timestamp,amount,currency,customer_id,product_id,quantity",
+            f"{uuid.uuid4()},2024-01-15T10:30:00Z,{amount},PLN,{uuid.uuid4()},{uuid.uuid4()},1",
+        ])
+
+        CSVProcessor().process_file(StringIO(csv_content))
+
+        assert Transaction.objects.get().amount == expected
+        assert Transaction(amount=amount).amount == expected
+
+    def test_duplicate_transaction_ids_reported_per_row(self, db, sample_transaction):
+        """Test that ids repeated in the file or already stored fail only their own rows"""
+        processor = CSVProcessor()
+
+        existing_id = sample_transaction.transaction_id
+        csv_content = f"""transaction_id,timestamp,amount,currency,customer_id,product_id,quantity
+f47ac10b-58cc-4372-a567-0e02b2c3d479,2024-01-15T10:30:00Z,99.99,PLN,550e8400-e29b-41d4-a716-446655440001,6ba7b810-9dad-11d1-80b4-00c04fd430c8,2
+f47ac10b-58cc-4372-a567-0e02b2c3d479,2024-01-15T10:30:00Z,99.99,PLN,550e8400-e29b-41d4-a716-446655440001,6ba7b810-9dad-11d1-80b4-00c04fd430c8,2
+{existing_id},2024-01-15T14:22:15Z,149.50,EUR,550e8400-e29b-41d4-a716-446655440002,6ba7b810-9dad-11d1-80b4-00c04fd430c9,1"""
+
+        result = processor.process_file(StringIO(csv_content))
+
+        assert result['successful_transactions'] == 1
+        assert result['failed_rows'] == 2
+        assert any('Row 2' in error and 'Duplicate' in error for error in result['errors'])
+        assert any('Row 3' in error and 'already exists' in error for error in result['errors'])
+        assert Transaction.objects.count() == 2
+
+    def test_imported_values_round_trip(self, db, csv_file):
+        """Test that imported rows keep their values and get auto timestamps"""
+        CSVProcessor().process_file(csv_file)
+
+        transaction = Transaction.objects.get(transaction_id='f47ac10b-58cc-4372-a567-0e02b2c3d480')
+        assert transaction.amount == Decimal('149.50')
+        assert transaction.currency == 'EUR'
+        assert transaction.quantity == 1
+        assert transaction.customer_id == uuid.UUID('550e8400-e29b-41d4-a716-446655440002')
+        assert transaction.timestamp == datetime(2024, 1, 15, 14, 22, 15, tzinfo=timezone.utc)
+        assert transaction.created_at is not None
+        assert transaction.updated_at is not None
+
+    def test_chunked_processing_merges_results(self, db):
+        """Test that chunk tasks number rows by file position and merge into one result"""
+        # Same mix as test_partial_success_processing, split into single-row chunks
+        csv_content = """transaction_id,timestamp,amount,currency,customer_id,product_id,quantity
+f47ac10b-58cc-4372-a567-0e02b2c3d479,2024-01-15T10:30:00Z,99.99,PLN,550e8400-e29b-41d4-a716-446655440001,6ba7b810-9dad-11d1-80b4-00c04fd430c8,2
+invalid-uuid,2024-01-15T10:30:00Z,99.99,PLN,550e8400-e29b-41d4-a716-446655440001,6ba7b810-9dad-11d1-80b4-00c04fd430c8,2
+f47ac10b-58cc-4372-a567-0e02b2c3d480,2024-01-15T14:22:15Z,149.50,EUR,550e8400-e29b-41d4-a716-446655440002,6ba7b810-9dad-11d1-80b4-00c04fd430c9,1"""
+
+        chunks = CSVProcessor().iter_chunks(StringIO(csv_content), chunksize=1)
+        result = merge_csv_results([
+            process_csv_chunk(chunk.to_csv(index=False), chunk.index.start) for chunk in chunks
+        ])
+
+        assert result['total_rows'] == 3
+        assert result['successful_transactions'] == 2
+        assert result['failed_rows'] == 1
+        assert result['errors'][0].startswith('Row 2:')
+        assert len(result['created_transactions']) == 2
+        assert Transaction.objects.count() == 2
+
+    def test_chunk_invalidates_cached_reports_on_commit(self, db, csv_file, django_capture_on_commit_callbacks):
+        """Test that a stored chunk invalidates cached reports without waiting for the merge"""
+        version = get_report_version()
+        chunk = next(CSVProcessor().iter_chunks(csv_file))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            process_csv_chunk(chunk.to_csv(index=False), chunk.index.start)
+
+        assert get_report_version() != version
@@ -5,7 +5,9 @@ from decimal import Decimal
 import pytest
 from django.db import IntegrityError
 
+from transactions.admin import TransactionAdminForm
 from transactions.models import Transaction
+from transactions.services.transaction_service import TransactionService
 
 
 @pytest.mark.unit
@@ -29,7 +31,7 @@ class TestTransactionModel:
         assert str(sample_transaction) == expected
 
     def test_transaction_ordering(self, db):
-        """Test that transactions are ordered by timestamp descending"""
+        """Test that transaction listings are ordered by timestamp descending"""
         # Create transactions with different timestamps
         older_transaction = Transaction.objects.create(
             transaction_id=uuid.uuid4(),
@@ -51,7 +53,7 @@ class TestTransactionModel:
             quantity=1
         )
 
-        transactions = list(Transaction.objects.all())
+        transactions = list(TransactionService.filter_transactions())
         assert transactions[0] == newer_transaction
         assert transactions[1] == older_transaction
 
@@ -70,6 +72,44 @@ class TestTransactionModel:
         transaction = Transaction.objects.create(**sample_transaction_data)
         assert transaction.amount == Decimal('123.45')
 
+    def test_amount_stored_as_cents(self, db, sample_transaction_data):
+        """Test that amounts are stored as whole cents, rounded half to even, and read back as Decimal"""
+        sample_transaction_data['amount'] = Decimal('0.135')
+        transaction = Transaction.objects.create(**sample_transaction_data)
+        transaction.refresh_from_db()
+
+        assert transaction.amount_cents == 14
+        assert transaction.amount == Decimal('0.14')
+        assert Transaction.to_cents(Decimal('0.125')) == 12
+
+    def test_amount_range_matches_former_decimal_column(self, sample_transaction_data):
+        """Test that amounts keep the numeric(10, 2) range of below 10^8"""
+        assert Transaction.to_cents(Decimal('99999999.99')) == 9999999999
+
+        for amount in [Decimal('99999999.995'), Decimal('99999999999.99'), Decimal('-100000000')]:
+            with pytest.raises(ValueError, match="amount must be less than 100000000"):
+                Transaction(**{**sample_transaction_data, 'amount': amount})
+
+    def test_admin_form_edits_amount_in_currency_units(self, db, sample_transaction):
+        """Test that the admin form shows and accepts amounts in currency units, not cents"""
+        form = TransactionAdminForm(instance=sample_transaction)
+        assert form.initial['amount'] == Decimal('99.99')
+
+        data = {
+            'timestamp': '2024-01-15 10:30:00',
+            'amount': '12.50',
+            'currency': 'EUR',
+            'customer_id': sample_transaction.customer_id,
+            'product_id': sample_transaction.product_id,
+            'quantity': 3,
+        }
+        form = TransactionAdminForm(data, instance=sample_transaction)
+        assert form.is_valid(), form.errors
+        form.save()
+
+        sample_transaction.refresh_from_db()
+        assert sample_transaction.amount_cents == 1250
+
     def test_positive_quantity_constraint(self, db, sample_transaction_data):
         """Test that quantity must be positive"""
         # This should work with positive quantity
@@ -3,10 +3,20 @@ from decimal import Decimal
 
 import pytest
 from django.urls import reverse
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.test import APIClient
 
+from token_auth.models import ApiToken
 from transactions.models import Transaction
+from transactions.serializers import TransactionSerializer
+
+# Resolved once at import; conftest has already set up Django
+UPLOAD_URL = reverse('transaction-upload')
+LIST_URL = reverse('transaction-list')
+
+
+def detail_url(transaction_id):
+    return reverse('transaction-detail', kwargs={'transaction_id': transaction_id})
 
 
 @pytest.mark.integration
@@ -19,7 +29,7 @@ class TestTransactionViews:
 
     def test_upload_valid_csv_file(self, db, api_client, csv_file):
         """Test uploading a valid CSV file"""
-        url = reverse('transaction-upload')
+        url = UPLOAD_URL
         response = api_client.post(url, {'file': csv_file}, format='multipart')
 
         assert response.status_code == status.HTTP_202_ACCEPTED
@@ -28,10 +38,12 @@ class TestTransactionViews:
         assert 'task_id' in data
         assert data['status'] == 'processing'
         assert 'message' in data
+        assert response['Location'] == reverse('task-status', kwargs={'task_id': data['task_id']})
+        assert response['Retry-After'] == '1'
 
     def test_upload_invalid_csv_file(self, db, api_client, invalid_csv_file):
         """Test uploading an invalid CSV file"""
-        url = reverse('transaction-upload')
+        url = UPLOAD_URL
         response = api_client.post(url, {'file': invalid_csv_file}, format='multipart')
 
         assert response.status_code == status.HTTP_202_ACCEPTED
@@ -43,7 +55,7 @@ class TestTransactionViews:
 
     def test_upload_non_csv_file(self, db, api_client, non_csv_file):
         """Test uploading a non-CSV file"""
-        url = reverse('transaction-upload')
+        url = UPLOAD_URL
         response = api_client.post(url, {'file': non_csv_file}, format='multipart')
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -52,7 +64,7 @@ class TestTransactionViews:
 
     def test_upload_no_file(self, db, api_client):
         """Test upload endpoint without providing a file"""
-        url = reverse('transaction-upload')
+        url = UPLOAD_URL
         response = api_client.post(url, {}, format='multipart')
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -61,7 +73,7 @@ class TestTransactionViews:
 
     def test_list_transactions(self, db, api_client, multiple_transactions):
         """Test listing all transactions"""
-        url = reverse('transaction-list')
+        url = LIST_URL
         response = api_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
@@ -82,7 +94,7 @@ class TestTransactionViews:
     def test_filter_transactions_by_customer(self, db, api_client, multiple_transactions):
         """Test filtering transactions by customer_id"""
         customer_id = '550e8400-e29b-41d4-a716-446655440001'
-        url = reverse('transaction-list')
+        url = LIST_URL
         response = api_client.get(url, {'customer_id': customer_id})
 
         assert response.status_code == status.HTTP_200_OK
@@ -98,7 +110,7 @@ class TestTransactionViews:
     def test_filter_transactions_by_product(self, db, api_client, multiple_transactions):
         """Test filtering transactions by product_id"""
         product_id = '6ba7b810-9dad-11d1-80b4-00c04fd430c8'
-        url = reverse('transaction-list')
+        url = LIST_URL
         response = api_client.get(url, {'product_id': product_id})
 
         assert response.status_code == status.HTTP_200_OK
@@ -116,7 +128,7 @@ class TestTransactionViews:
         customer_id = '550e8400-e29b-41d4-a716-446655440001'
         product_id = '6ba7b810-9dad-11d1-80b4-00c04fd430c8'
 
-        url = reverse('transaction-list')
+        url = LIST_URL
         response = api_client.get(url, {
             'customer_id': customer_id,
             'product_id': product_id
@@ -134,7 +146,7 @@ class TestTransactionViews:
 
     def test_get_transaction_detail(self, db, api_client, sample_transaction):
         """Test retrieving a single transaction by ID"""
-        url = reverse('transaction-detail', kwargs={'transaction_id': sample_transaction.transaction_id})
+        url = detail_url(sample_transaction.transaction_id)
         response = api_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
@@ -145,10 +157,16 @@ class TestTransactionViews:
         assert data['currency'] == sample_transaction.currency
         assert data['quantity'] == sample_transaction.quantity
 
+    def test_transaction_representation_matches_serializer_fields(self, db, sample_transaction):
+        """Test that the direct representation equals DRF's declared-field output"""
+        serializer = TransactionSerializer(sample_transaction)
+
+        assert serializer.data == serializers.ModelSerializer.to_representation(serializer, sample_transaction)
+
     def test_get_nonexistent_transaction(self, db, api_client):
         """Test retrieving a transaction that doesn't exist"""
         nonexistent_id = uuid.uuid4()
-        url = reverse('transaction-detail', kwargs={'transaction_id': nonexistent_id})
+        url = detail_url(nonexistent_id)
         response = api_client.get(url)
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -171,18 +189,49 @@ class TestTransactionViews:
             ))
         Transaction.objects.bulk_create(transactions)
 
-        url = reverse('transaction-list')
+        url = LIST_URL
         response = api_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
 
         # Check pagination fields
-        assert 'count' in data
         assert 'next' in data
         assert 'previous' in data
         assert 'results' in data
-        assert data['count'] == 15
+        assert len(data['results']) == 15
+
+    def test_transaction_list_cursor_pages(self, db, api_client):
+        """Test that following next links visits every transaction exactly once"""
+        # Shared timestamps force the cursor to break ties by transaction_id
+        Transaction.objects.bulk_create([
+            Transaction(
+                transaction_id=uuid.uuid4(),
+                timestamp=f'2024-01-{day:02d}T10:30:00Z',
+                amount=Decimal('100.00'),
+                currency='PLN',
+                customer_id=uuid.uuid4(),
+                product_id=uuid.uuid4(),
+                quantity=1
+            )
+            for day in (1, 1, 1, 2, 2, 3, 4, 4, 4, 4, 5)
+        ])
+
+        seen_ids = []
+        timestamps = []
+        response = api_client.get(LIST_URL, {'page_size': 3})
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            data = response.json()
+            assert len(data['results']) <= 3
+            seen_ids.extend(transaction['transaction_id'] for transaction in data['results'])
+            timestamps.extend(transaction['timestamp'] for transaction in data['results'])
+            if not data['next']:
+                break
+            response = api_client.get(data['next'])
+
+        assert len(seen_ids) == len(set(seen_ids)) == 11
+        assert timestamps == sorted(timestamps, reverse=True)
 
     def test_invalid_uuid_in_detail_view(self, db, api_client):
         """Test detail view with invalid UUID format"""
@@ -190,4 +239,63 @@ class TestTransactionViews:
         response = api_client.get(url)
 
         # Should return 404 due to URL pattern not matching
-        assert response.status_code == status.HTTP_404_NOT_FOUND
\ No newline at end of file
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_token_lookup_is_cached(self, db, api_client, sample_transaction, django_assert_num_queries):
+        """Test that a validated token is not looked up again on later requests"""
+        url = detail_url(sample_transaction.transaction_id)
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        # Only the transaction fetch remains; last_used_at was updated by the first request
+        with django_assert_num_queries(1):
+            assert api_client.get(url).status_code == status.HTTP_200_OK
+
+    def test_deactivated_token_is_rejected(self, db, api_client, api_token, sample_transaction):
+        """Test that deactivating a token invalidates its cached lookup"""
+        url = detail_url(sample_transaction.transaction_id)
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        api_token.is_active = False
+        api_token.save()
+
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_bulk_deactivated_token_is_rejected(self, db, api_client, api_token, sample_transaction):
+        """Test that a queryset update, which sends no signals, also invalidates the cached lookup"""
+        url = detail_url(sample_transaction.transaction_id)
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        ApiToken.objects.filter(token=api_token.token).update(is_active=False)
+
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_request_without_token_is_rejected(self, db, sample_transaction):
+        """Test that API requests without a token parameter are rejected"""
+        response = APIClient().get(LIST_URL, {'customer_id': str(sample_transaction.customer_id)})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_conditional_get_returns_not_modified(self, db, api_client, sample_transaction):
+        """Test that list and detail responses honor If-None-Match until transactions change"""
+        urls = [
+            LIST_URL,
+            detail_url(sample_transaction.transaction_id),
+        ]
+        etags = {}
+        for url in urls:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            etags[url] = response['ETag']
+
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        sample_transaction.quantity = 5
+        sample_transaction.save()
+
+        for url in urls:
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == status.HTTP_200_OK
+            assert response['ETag'] != etags[url]
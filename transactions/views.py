@@ -1,11 +1,17 @@
 
+from celery import states
 from celery.result import AsyncResult
 from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework import generics, status
 from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from reports.services.report_service import report_etag
+from .pagination import TransactionCursorPagination
 from .serializers import TransactionSerializer
 from .services.transaction_service import TransactionService
 from .tasks import process_csv_file_async
@@ -23,7 +29,8 @@ class TransactionUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        if not file.name.endswith('.csv'):
+        # Any letter case is accepted, so EXPORT.CSV uploads are not rejected
+        if not file.name.lower().endswith('.csv'):
             return Response(
                 {'error': 'Only CSV files are allowed'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -33,11 +40,15 @@ class TransactionUploadView(APIView):
             file_path = default_storage.save(f'uploads/{file.name}', file)
             task = process_csv_file_async.delay(file_path)
             
+            # Point clients at the status endpoint and pace their polling
             return Response({
                 'message': 'File uploaded successfully. Processing started.',
                 'task_id': task.id,
                 'status': 'processing'
-            }, status=status.HTTP_202_ACCEPTED)
+            }, status=status.HTTP_202_ACCEPTED, headers={
+                'Location': reverse('task-status', kwargs={'task_id': task.id}),
+                'Retry-After': '1'
+            })
         except Exception as e:
             return Response(
                 {'error': f'Failed to upload file: {str(e)}'},
@@ -45,9 +56,11 @@ class TransactionUploadView(APIView):
             )
 
 
+@method_decorator(condition(etag_func=report_etag), name='get')
 class TransactionListView(generics.ListAPIView):
     """List transactions with pagination and filtering"""
     serializer_class = TransactionSerializer
+    pagination_class = TransactionCursorPagination
 
     def get_queryset(self):
         customer_id = self.request.query_params.get('customer_id')
@@ -59,6 +72,7 @@ class TransactionListView(generics.ListAPIView):
         )
 
 
+@method_decorator(condition(etag_func=report_etag), name='get')
 class TransactionDetailView(APIView):
     """Get single transaction details"""
 
@@ -79,18 +93,20 @@ class TaskStatusView(APIView):
 
     def get(self, request, task_id):
         try:
-            task = AsyncResult(task_id)
+            # Read the task state once; status, ready() and result would each
+            # query the result backend while the task is still running
+            meta = AsyncResult(task_id).backend.get_task_meta(task_id)
+            task_status = meta['status']
             response_data = {
                 'task_id': task_id,
-                'status': task.status,
-                'ready': task.ready()
+                'status': task_status,
+                'ready': task_status in states.READY_STATES
             }
             
-            if task.ready():
-                if task.successful():
-                    response_data['result'] = task.result
-                else:
-                    response_data['error'] = str(task.info)
+            if task_status == states.SUCCESS:
+                response_data['result'] = meta['result']
+            elif response_data['ready']:
+                response_data['error'] = str(meta['result'])
             
             return Response(response_data)
         except Exception as e:
@@ -0,0 +1,10 @@
+"""
+Cache helpers shared by the transaction system apps
+"""
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+
+
+def cache_enabled() -> bool:
+    """Whether the default cache stores anything, i.e. a shared backend is configured"""
+    return not isinstance(caches['default'], DummyCache)
@@ -1,6 +1,28 @@
+import functools
 from decimal import Decimal
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models import Case, DecimalField, Value, When
+from django.dispatch import receiver
+
+
+@functools.lru_cache(maxsize=64)
+def _rate_for(currency):
+    """
+    Return the configured PLN exchange rate for a currency as Decimal
+
+    Rates come from settings and do not change at runtime, so each currency
+    is parsed only once. The cache is cleared when CURRENCY_EXCHANGE_RATES
+    is overridden (e.g. in tests).
+
+    Raises:
+        ValueError: If the currency is not configured
+    """
+    try:
+        return Decimal(str(settings.CURRENCY_EXCHANGE_RATES[currency]))
+    except KeyError:
+        raise ValueError(f"Unsupported currency: {currency}")
 
 
 def convert_to_pln(amount, currency):
@@ -14,18 +36,54 @@ def convert_to_pln(amount, currency):
     Returns:
         Decimal: Amount in PLN
     """
+    # Decimals need no conversion; other types go through str() so floats keep
+    # their shortest repr instead of their exact binary value
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+
     if currency == 'PLN':
-        return Decimal(str(amount))
+        return amount
 
-    exchange_rates = settings.CURRENCY_EXCHANGE_RATES
+    return amount * _rate_for(currency)
+
+
+@functools.lru_cache(maxsize=16)
+def pln_expression(amount, currency_field='currency'):
+    """
+    Build a SQL expression converting an amount to PLN inside the database
+
+    The expression is a CASE over the configured currencies multiplying the
+    amount by its exchange rate. Rows in an unsupported currency evaluate to
+    NULL, so SQL aggregates such as SUM() skip them. The tree is built once
+    per (amount, currency_field); querysets resolve a copy of it, so the
+    shared instance is never mutated.
+
+    Args:
+        amount: Expression holding the amount in its original currency, e.g. F('amount_cents')
+        currency_field (str): Name of the field holding the currency code
+
+    Returns:
+        Case: Expression usable in annotate() / aggregate()
+    """
+    return Case(
+        *[
+            When(**{currency_field: currency}, then=amount * Value(_rate_for(currency)))
+            for currency in settings.CURRENCY_EXCHANGE_RATES
+        ],
+        output_field=DecimalField(max_digits=20, decimal_places=4)
+    )
 
-    if currency not in exchange_rates:
-        raise ValueError(f"Unsupported currency: {currency}")
 
-    rate = Decimal(str(exchange_rates[currency]))
-    return Decimal(str(amount)) * rate
+@receiver(setting_changed)
+def _clear_rate_caches(setting, **kwargs):
+    """Drop cached rates and expressions when exchange rates are overridden"""
+    if setting == 'CURRENCY_EXCHANGE_RATES':
+        _rate_for.cache_clear()
+        pln_expression.cache_clear()
+        get_supported_currencies.cache_clear()
 
 
+@functools.lru_cache(maxsize=None)
 def get_supported_currencies():
-    """Return list of supported currencies"""
-    return list(settings.CURRENCY_EXCHANGE_RATES.keys())
+    """Return the supported currency codes as a tuple, built once from settings"""
+    return tuple(settings.CURRENCY_EXCHANGE_RATES)
@@ -1,9 +1,14 @@
 """
 Enhanced logging utilities for the transaction system
 """
+import atexit
 import functools
 import logging
-import traceback
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from time import perf_counter
 from django.conf import settings
 from typing import Any, Dict, Optional
 
@@ -18,15 +23,24 @@ class TransactionSystemLogger:
                                 amount: float, currency: str) -> None:
         """Log transaction creation with structured data"""
         self.logger.info(
-            f"Transaction created - ID: {transaction_id}, "
-            f"Customer: {customer_id}, Amount: {amount} {currency}"
+            "Transaction created - ID: %s, Customer: %s, Amount: %s %s",
+            transaction_id, customer_id, amount, currency
         )
 
-    def log_transaction_error(self, error: Exception, context: Dict[str, Any]) -> None:
-        """Log transaction-related errors with context"""
+    def log_transaction_error(self, error: Exception, context: Dict[str, Any], *,
+                              with_traceback: Optional[bool] = None) -> None:
+        """
+        Log transaction-related errors with context
+
+        The traceback is only attached when with_traceback is set, or by default
+        when DEBUG is enabled, so repetitive expected failures skip formatting it.
+        The context is also passed as record.context for structured handlers.
+        """
+        # The context dict is only rendered if the record is emitted
         self.logger.error(
-            f"Transaction error: {str(error)}, Context: {context}",
-            exc_info=True
+            "Transaction error: %s, Context: %s", error, context,
+            exc_info=self._traceback_wanted(with_traceback),
+            extra={'context': context}
         )
 
     def log_csv_processing(self, filename: str, rows_processed: int,
@@ -34,67 +48,79 @@ class TransactionSystemLogger:
         """Log CSV processing results"""
         if errors > 0:
             self.logger.warning(
-                f"CSV processing completed with errors - File: {filename}, "
-                f"Processed: {rows_processed}, Errors: {errors}"
+                "CSV processing completed with errors - File: %s, Processed: %s, Errors: %s",
+                filename, rows_processed, errors
             )
         else:
             self.logger.info(
-                f"CSV processing completed successfully - File: {filename}, "
-                f"Processed: {rows_processed} rows"
+                "CSV processing completed successfully - File: %s, Processed: %s rows",
+                filename, rows_processed
             )
 
     def log_report_generation(self, report_type: str, entity_id: str,
                               execution_time: float = None) -> None:
         """Log report generation"""
-        message = f"Generated {report_type} report for {entity_id}"
         if execution_time:
-            message += f" (execution time: {execution_time:.3f}s)"
-        self.logger.info(message)
+            self.logger.info("Generated %s report for %s (execution time: %.3fs)",
+                             report_type, entity_id, execution_time)
+        else:
+            self.logger.info("Generated %s report for %s", report_type, entity_id)
 
     def log_api_request(self, method: str, path: str, user: str = "anonymous",
                         status_code: int = None) -> None:
         """Log API requests"""
-        message = f"API {method} {path} by {user}"
         if status_code:
-            message += f" -> {status_code}"
-        self.logger.info(message)
+            self.logger.info("API %s %s by %s -> %s", method, path, user, status_code)
+        else:
+            self.logger.info("API %s %s by %s", method, path, user)
 
     def log_database_error(self, operation: str, error: Exception,
-                           table: str = None) -> None:
-        """Log database-related errors"""
-        message = f"Database error during {operation}"
+                           table: str = None, *, with_traceback: Optional[bool] = None) -> None:
+        """Log database-related errors, with a traceback as in log_transaction_error"""
+        exc_info = self._traceback_wanted(with_traceback)
         if table:
-            message += f" on table {table}"
-        message += f": {str(error)}"
-        self.logger.error(message, exc_info=True)
+            self.logger.error("Database error during %s on table %s: %s", operation, table, error, exc_info=exc_info)
+        else:
+            self.logger.error("Database error during %s: %s", operation, error, exc_info=exc_info)
+
+    def _traceback_wanted(self, with_traceback: Optional[bool]) -> bool:
+        """Resolve a with_traceback argument, defaulting to whether DEBUG is enabled"""
+        if with_traceback is None:
+            return self.logger.isEnabledFor(logging.DEBUG)
+        return with_traceback
 
     def log_validation_error(self, field: str, value: Any, error_message: str) -> None:
         """Log validation errors"""
         self.logger.warning(
-            f"Validation error - Field: {field}, Value: {value}, "
-            f"Error: {error_message}"
+            "Validation error - Field: %s, Value: %s, Error: %s",
+            field, value, error_message
         )
 
-    def info(self, message: str, extra: Dict[str, Any] = None) -> None:
-        """Enhanced info logging with extra context"""
-        self.logger.info(message, extra=extra)
+    def info(self, message: str, *args: Any, extra: Dict[str, Any] = None) -> None:
+        """Enhanced info logging with extra context and lazy %-style arguments"""
+        self.logger.info(message, *args, extra=extra)
 
-    def warning(self, message: str, extra: Dict[str, Any] = None) -> None:
-        """Enhanced warning logging with extra context"""
-        self.logger.warning(message, extra=extra)
+    def warning(self, message: str, *args: Any, extra: Dict[str, Any] = None) -> None:
+        """Enhanced warning logging with extra context and lazy %-style arguments"""
+        self.logger.warning(message, *args, extra=extra)
 
-    def error(self, message: str, exc_info: bool = False,
+    def error(self, message: str, *args: Any, exc_info: bool = False,
               extra: Dict[str, Any] = None) -> None:
-        """Enhanced error logging with extra context"""
-        self.logger.error(message, exc_info=exc_info, extra=extra)
+        """Enhanced error logging with extra context and lazy %-style arguments"""
+        self.logger.error(message, *args, exc_info=exc_info, extra=extra)
+
+    def debug(self, message: str, *args: Any, extra: Dict[str, Any] = None) -> None:
+        """Enhanced debug logging with extra context and lazy %-style arguments"""
+        self.logger.debug(message, *args, extra=extra)
 
-    def debug(self, message: str, extra: Dict[str, Any] = None) -> None:
-        """Enhanced debug logging with extra context"""
-        self.logger.debug(message, extra=extra)
+    def log(self, level: int, message: str, *args: Any, extra: Dict[str, Any] = None) -> None:
+        """Log at a level chosen at runtime, with lazy %-style arguments"""
+        self.logger.log(level, message, *args, extra=extra)
 
 
+@functools.lru_cache(maxsize=None)
 def get_logger(name: str) -> TransactionSystemLogger:
-    """Get a custom logger instance"""
+    """Get a custom logger instance, shared per name like logging.getLogger()"""
     return TransactionSystemLogger(name)
 
 
@@ -102,16 +128,14 @@ def log_exceptions(logger_name: str = None):
     """Decorator to automatically log exceptions"""
 
     def decorator(func):
+        logger = get_logger(logger_name or func.__module__)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            logger = get_logger(logger_name or func.__module__)
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                logger.error(
-                    f"Exception in {func.__name__}: {str(e)}",
-                    exc_info=True
-                )
+                logger.error("Exception in %s: %s", func.__name__, e, exc_info=True)
                 raise
 
         return wrapper
@@ -123,31 +147,26 @@ def log_performance(logger_name: str = None, threshold: float = 1.0):
     """Decorator to log performance metrics"""
 
     def decorator(func):
+        logger = get_logger(logger_name or func.__module__)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            import time
-            logger = get_logger(logger_name or func.__module__)
-
-            start_time = time.time()
+            start_time = perf_counter()
             try:
                 result = func(*args, **kwargs)
-                execution_time = time.time() - start_time
+                execution_time = perf_counter() - start_time
 
                 if execution_time > threshold:
-                    logger.warning(
-                        f"Slow execution detected - {func.__name__}: "
-                        f"{execution_time:.3f}s"
-                    )
-                else:
-                    logger.debug(
-                        f"Function {func.__name__} executed in {execution_time:.3f}s"
-                    )
+                    logger.warning("Slow execution detected - %s: %.3fs", func.__name__, execution_time)
+                elif logger.logger.isEnabledFor(logging.DEBUG):
+                    # Fast calls are only reported at DEBUG; skip the call chain otherwise
+                    logger.debug("Function %s executed in %.3fs", func.__name__, execution_time)
 
                 return result
             except Exception as e:
-                execution_time = time.time() - start_time
+                execution_time = perf_counter() - start_time
                 logger.error(
-                    f"Exception in {func.__name__} after {execution_time:.3f}s: {str(e)}",
+                    "Exception in %s after %.3fs: %s", func.__name__, execution_time, e,
                     exc_info=True
                 )
                 raise
@@ -167,37 +186,81 @@ class LoggingContextManager:
         self.start_time = None
 
     def __enter__(self):
-        import time
-        self.start_time = time.time()
-        self.logger.info(f"Starting {self.operation}", extra=self.context)
+        self.start_time = perf_counter()
+        self.logger.info("Starting %s", self.operation, extra=self.context)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        import time
-        execution_time = time.time() - self.start_time
+        execution_time = perf_counter() - self.start_time
 
         if exc_type is None:
             self.logger.info(
-                f"Completed {self.operation} successfully in {execution_time:.3f}s",
+                "Completed %s successfully in %.3fs", self.operation, execution_time,
                 extra=self.context
             )
         else:
             self.logger.error(
-                f"Failed {self.operation} after {execution_time:.3f}s: {str(exc_val)}",
+                "Failed %s after %.3fs: %s", self.operation, execution_time, exc_val,
                 exc_info=True,
                 extra=self.context
             )
 
 
 def create_logs_directory():
-    """Ensure logs directory exists with proper structure"""
-    from pathlib import Path
-    from django.conf import settings
-
-    logs_dir = Path(settings.BASE_DIR) / 'logs'
-    logs_dir.mkdir(exist_ok=True)
+    """
+    Ensure logs directory exists with proper structure
 
-    # Create subdirectories for organized logging
-    (logs_dir / 'archive').mkdir(exist_ok=True)
+    Called once per process from TransactionsConfig.ready(); a single mkdir
+    creates both the logs directory and its archive subdirectory.
+    """
+    logs_dir = Path(settings.LOGS_DIR)
+    (logs_dir / 'archive').mkdir(parents=True, exist_ok=True)
 
     return logs_dir
+
+
+# (QueueHandler, QueueListener) pairs installed by queue_logger_handlers()
+_queued_handlers = []
+
+
+def queue_logger_handlers(name: str) -> None:
+    """
+    Move a logger's handlers behind a queue drained by a background thread
+
+    The logger keeps a single QueueHandler, so logging calls only enqueue the
+    record; a QueueListener emits it through the original handlers, honouring
+    their levels. Listeners are stopped at exit, flushing pending records.
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers or any(isinstance(handler, QueueHandler) for handler in logger.handlers):
+        return
+
+    queue_handler = QueueHandler(queue.SimpleQueue())
+    listener = QueueListener(queue_handler.queue, *logger.handlers, respect_handler_level=True)
+    logger.handlers = [queue_handler]
+    listener.start()
+
+    if not _queued_handlers:
+        atexit.register(_stop_queue_listeners)
+        os.register_at_fork(after_in_child=_restart_queue_listeners)
+    _queued_handlers.append((queue_handler, listener))
+
+
+def _stop_queue_listeners() -> None:
+    """Emit every queued record and stop the listener threads"""
+    for _, listener in _queued_handlers:
+        listener.stop()
+
+
+def _restart_queue_listeners() -> None:
+    """
+    Give forked children (Celery prefork, gunicorn workers) their own listeners
+
+    Threads do not survive fork, so each child starts fresh listeners over empty
+    queues; records still pending in the parent are emitted by the parent only.
+    """
+    for index, (queue_handler, listener) in enumerate(_queued_handlers):
+        queue_handler.queue = queue.SimpleQueue()
+        listener = QueueListener(queue_handler.queue, *listener.handlers, respect_handler_level=True)
+        listener.start()
+        _queued_handlers[index] = (queue_handler, listener)
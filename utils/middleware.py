@@ -1,60 +1,164 @@
-import json
-import logging
+import atexit
 import logging
+import threading
 import time
-from django.http import HttpRequest, HttpResponse
-from django.http import JsonResponse
-from django.http import JsonResponse
-from django.utils import timezone
-from django.utils import timezone
-from django.utils.deprecation import MiddlewareMixin
-from rest_framework import status
-from rest_framework import status
-from typing import Callable
-
-from token_auth.models import ApiToken
+from collections import Counter
+from typing import Callable, Optional, Tuple
+
+import orjson
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError
+from django.http import HttpRequest, HttpResponse, JsonResponse
+
 from utils.logging_utils import get_logger
 
-logger = logging.getLogger(__name__)
+# Health checks and static files are not worth a log line
+_SKIP_LOGGING_PREFIXES = (
+    '/favicon.ico',
+    '/health/',
+    '/static/',
+    '/admin/jsi18n/',
+)
 
+# Larger request bodies are never read just to be logged
+_MAX_LOGGED_BODY_BYTES = 16 * 1024
 
-class RequestLoggingMiddleware(MiddlewareMixin):
-    """Middleware to log API requests and responses"""
+# Request body fields redacted before logging
+_SENSITIVE_FIELDS = frozenset(('password', 'token', 'api_key', 'secret'))
+
+# Response log level by status code class (4xx, 5xx); other responses log at INFO
+_LOG_LEVEL_FOR_STATUS_CLASS = {4: logging.WARNING, 5: logging.ERROR}
+
+# Requests slower than this many seconds are counted and reported together
+# once per window, instead of with a warning each
+SLOW_REQUEST_THRESHOLD = 2.0
+SLOW_REQUEST_WINDOW = 10.0
+
+
+class SlowRequestCounter:
+    """
+    Thread-safe per-endpoint count of slow requests over a reporting window
+
+    Windows are closed by the caller rather than a timer, so one can span longer
+    than window seconds when no request arrives to close it; pop_window()
+    returns the actual span with the counts.
+    """
+
+    def __init__(self, window: float = SLOW_REQUEST_WINDOW):
+        self.window = window
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._window_start = time.perf_counter()
+
+    def add(self, method: str, path: str) -> None:
+        with self._lock:
+            self._counts[(method, path)] += 1
+
+    def pop_window(self, now: float, force: bool = False) -> Optional[Tuple[Counter, float]]:
+        """
+        Return and reset the counts and the seconds they span once the window has
+        elapsed, or at any time with force; None before that or if nothing was counted
+        """
+        if not force and now - self._window_start < self.window:
+            return None
+
+        with self._lock:
+            elapsed = now - self._window_start
+            if not force and elapsed < self.window:
+                return None
+            counts, self._counts = self._counts, Counter()
+            self._window_start = now
+
+        return (counts, elapsed) if counts else None
+
+
+class HybridMiddleware:
+    """
+    Base for middleware that runs natively under both WSGI and ASGI
+
+    Unlike MiddlewareMixin, which runs its request/response hooks through
+    sync_to_async under ASGI, the hooks here are called inline; they only log
+    and never block on I/O.
+    """
+    sync_capable = True
+    async_capable = True
 
     def __init__(self, get_response: Callable):
         self.get_response = get_response
         self.logger = get_logger(__name__)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.process_request(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request: HttpRequest):
+        self.process_request(request)
+        return self.process_response(request, await self.get_response(request))
+
+    def process_request(self, request: HttpRequest) -> None:
+        pass
+
+    def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        return response
+
+
+class RequestLoggingMiddleware(HybridMiddleware):
+    """Middleware to log API requests and responses"""
+
+    def __init__(self, get_response: Callable):
         super().__init__(get_response)
+        self.slow_requests = SlowRequestCounter()
+        # Report slow requests still counted when the process exits. atexit runs
+        # hooks in reverse order, so this precedes the queued log listeners'
+        # shutdown registered at app start-up and the warning is still written.
+        atexit.register(self._report_slow_requests, force=True)
 
     def process_request(self, request: HttpRequest) -> None:
         """Log incoming requests"""
         # Store start time for performance tracking
-        request._start_time = time.time()
+        request._start_time = time.perf_counter()
 
-        # Skip logging for health checks and static files
-        if self._should_skip_logging(request.path):
+        # Skip logging for health checks and static files, and all the work
+        # below when request lines would be discarded anyway
+        if self._should_skip_logging(request.path) or not self.logger.logger.isEnabledFor(logging.INFO):
             return
 
         # Log request details
-        user = getattr(request, 'user', None)
-        user_info = str(user) if user and hasattr(user, 'username') else 'anonymous'
-
         self.logger.log_api_request(
             method=request.method,
             path=request.path,
-            user=user_info
+            user=self._user_info(request)
         )
 
         # Log request body for POST/PUT/PATCH (excluding sensitive data)
         if request.method in ['POST', 'PUT', 'PATCH'] and request.content_type == 'application/json':
-            try:
-                if hasattr(request, 'body') and request.body:
-                    body = json.loads(request.body.decode('utf-8'))
-                    # Remove sensitive fields
-                    sanitized_body = self._sanitize_request_body(body)
-                    self.logger.debug(f"Request body: {json.dumps(sanitized_body)}")
-            except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                self.logger.debug(f"Could not parse request body: {str(e)}")
+            self._log_request_body(request)
+
+    def _log_request_body(self, request: HttpRequest) -> None:
+        """Log a small JSON request body at DEBUG, reading it only if it would be emitted"""
+        if not self.logger.logger.isEnabledFor(logging.DEBUG):
+            return
+
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return
+        if not 0 < content_length <= _MAX_LOGGED_BODY_BYTES:
+            return
+
+        try:
+            # orjson parses the raw bytes, validating UTF-8 itself
+            body = orjson.loads(request.body)
+            # Remove sensitive fields
+            sanitized_body = self._sanitize_request_body(body)
+            self.logger.debug("Request body: %s", orjson.dumps(sanitized_body).decode())
+        except orjson.JSONDecodeError as e:
+            self.logger.debug("Could not parse request body: %s", e)
 
     def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
         """Log response details"""
@@ -64,81 +168,75 @@ class RequestLoggingMiddleware(MiddlewareMixin):
         # Calculate request duration
         duration = None
         if hasattr(request, '_start_time'):
-            duration = time.time() - request._start_time
+            duration = time.perf_counter() - request._start_time
 
-        # Determine log level based on status code
-        if response.status_code >= 500:
-            log_level = 'error'
-        elif response.status_code >= 400:
-            log_level = 'warning'
-        else:
-            log_level = 'info'
+        # Determine log level based on status code class
+        log_level = _LOG_LEVEL_FOR_STATUS_CLASS.get(min(response.status_code // 100, 5), logging.INFO)
 
-        # Prepare log message
-        message = f"Response {response.status_code} for {request.method} {request.path}"
-        if duration:
-            message += f" in {duration:.3f}s"
+        # Log with appropriate level; the message is only formatted if emitted
+        args = (response.status_code, request.method, request.path)
+        if duration is not None:
+            self.logger.log(log_level, "Response %s for %s %s in %.3fs", *args, duration)
+        else:
+            self.logger.log(log_level, "Response %s for %s %s", *args)
 
-        # Log with appropriate level
-        getattr(self.logger, log_level)(message)
+        # Count slow requests; the response line above already carries each duration
+        now = time.perf_counter()
+        if duration is not None and duration > SLOW_REQUEST_THRESHOLD:
+            self.slow_requests.add(request.method, request.path)
 
-        # Log slow requests
-        if duration and duration > 2.0:
-            self.logger.warning(f"Slow request detected: {message}")
+        self._report_slow_requests(now)
 
         return response
 
+    def _report_slow_requests(self, now: Optional[float] = None, force: bool = False) -> None:
+        """Log the counted slow requests as one warning once their window has closed"""
+        window = self.slow_requests.pop_window(time.perf_counter() if now is None else now, force)
+        if window:
+            counts, elapsed = window
+            self.logger.warning(
+                "Slow requests (over %.1fs) in the last %.1fs: %s",
+                SLOW_REQUEST_THRESHOLD, elapsed,
+                ', '.join(f"{method} {path} x{count}" for (method, path), count in counts.most_common())
+            )
+
     def process_exception(self, request: HttpRequest, exception: Exception) -> None:
         """Log unhandled exceptions"""
         if self._should_skip_logging(request.path):
             return
 
-        user = getattr(request, 'user', None)
-        user_info = str(user) if user and hasattr(user, 'username') else 'anonymous'
-
         self.logger.error(
-            f"Unhandled exception in {request.method} {request.path} "
-            f"by user {user_info}: {str(exception)}",
+            "Unhandled exception in %s %s by user %s: %s",
+            request.method, request.path, self._user_info(request), exception,
             exc_info=True
         )
 
+    @staticmethod
+    def _user_info(request: HttpRequest) -> str:
+        """Username for log lines, read directly instead of through str(user)"""
+        return getattr(getattr(request, 'user', None), 'username', None) or 'anonymous'
+
     def _should_skip_logging(self, path: str) -> bool:
         """Determine if request should be skipped from logging"""
-        skip_paths = [
-            '/favicon.ico',
-            '/health/',
-            '/static/',
-            '/admin/jsi18n/',
-        ]
-        return any(path.startswith(skip_path) for skip_path in skip_paths)
+        return path.startswith(_SKIP_LOGGING_PREFIXES)
 
     def _sanitize_request_body(self, body: dict) -> dict:
-        """Remove sensitive information from request body"""
-        sensitive_fields = ['password', 'token', 'api_key', 'secret']
-        sanitized = body.copy()
-
-        for field in sensitive_fields:
-            if field in sanitized:
-                sanitized[field] = '***REDACTED***'
-
-        return sanitized
+        """Remove sensitive information from request body, returning a new dict"""
+        # Only top-level object keys are redacted; other JSON values have no fields
+        if not isinstance(body, dict):
+            return body
+
+        return {
+            field: '***REDACTED***' if field in _SENSITIVE_FIELDS else value
+            for field, value in body.items()
+        }
 
 
-class ErrorHandlingMiddleware(MiddlewareMixin):
+class ErrorHandlingMiddleware(HybridMiddleware):
     """Middleware for centralized error handling"""
 
-    def __init__(self, get_response: Callable):
-        self.get_response = get_response
-        self.logger = get_logger(__name__)
-        super().__init__(get_response)
-
     def process_exception(self, request: HttpRequest, exception: Exception) -> None:
         """Handle and log exceptions centrally"""
-        import traceback
-        from django.http import JsonResponse
-        from django.core.exceptions import ValidationError
-        from django.db import IntegrityError
-
         # Log the exception with context
         context = {
             'method': request.method,
@@ -148,7 +246,7 @@ class ErrorHandlingMiddleware(MiddlewareMixin):
         }
 
         self.logger.error(
-            f"Exception occurred: {str(exception)}",
+            "Exception occurred: %s", exception,
             exc_info=True,
             extra=context
         )
@@ -176,69 +274,3 @@ class ErrorHandlingMiddleware(MiddlewareMixin):
 
         # For non-API requests, let Django handle normally
         return None
-
-
-class ApiTokenAuthentication:
-    """
-    Simple token-based authentication middleware for API endpoints
-    Token is expected as URL parameter: ?token=your_token_here
-    """
-
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
-        # Only apply authentication to API endpoints
-        if request.path.startswith('/api/'):
-            auth_result = self.authenticate(request)
-            if auth_result is not None:
-                return auth_result
-
-        response = self.get_response(request)
-        return response
-
-    def authenticate(self, request):
-        """
-        Authenticate request using API token from URL parameter
-        Returns JsonResponse if authentication fails, None if success
-        """
-        # Get token from URL parameter
-        token = request.GET.get('token')
-
-        if not token:
-            return JsonResponse(
-                {'error': 'Token parameter required in URL.'},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-
-        token = token.strip()
-
-        if not token:
-            return JsonResponse(
-                {'error': 'Token parameter cannot be empty.'},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-
-        # Validate token
-        try:
-            api_token = ApiToken.objects.get(token=token, is_active=True)
-
-            # Update last used timestamp
-            api_token.last_used_at = timezone.now()
-            api_token.save(update_fields=['last_used_at'])
-
-            logger.info(f"API request authenticated with token: {token[:8]}...")
-            return None  # Success
-
-        except ApiToken.DoesNotExist:
-            logger.warning(f"Invalid API token used: {token[:8]}...")
-            return JsonResponse(
-                {'error': 'Invalid or inactive token'},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-        except Exception as e:
-            logger.error(f"Authentication error: {str(e)}")
-            return JsonResponse(
-                {'error': 'Authentication failed'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
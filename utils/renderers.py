@@ -0,0 +1,27 @@
+"""
+Fast JSON rendering for API responses
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson
+
+    UUIDs, datetimes, dicts and lists are serialized natively; anything else
+    (Decimal, lazy translation strings, querysets) falls back to DRF's encoder.
+    Indented output requested by the client is delegated to the stdlib renderer,
+    since orjson only supports a fixed two-space indent.
+    """
+    _encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return orjson.dumps(data, default=self._encoder.default)
@@ -0,0 +1,94 @@
+import logging
+import queue
+from logging.handlers import QueueHandler
+
+import pytest
+
+from utils import logging_utils
+from utils.logging_utils import queue_logger_handlers
+
+
+class ListHandler(logging.Handler):
+    """Keep emitted messages in a list"""
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def queued_logger():
+    """A logger with one WARNING handler, with any queue listener installed for it stopped afterwards"""
+    logger = logging.getLogger('utils.tests.queued')
+    logger.propagate = False
+    handler = ListHandler(logging.WARNING)
+    logger.handlers = [handler]
+    yield logger, handler
+
+    for pair in list(logging_utils._queued_handlers):
+        queue_handler, listener = pair
+        if queue_handler in logger.handlers:
+            listener.stop()
+            logging_utils._queued_handlers.remove(pair)
+    logger.handlers = []
+
+
+@pytest.mark.unit
+class TestQueueLoggerHandlers:
+    """Test moving logger handlers behind a queue"""
+
+    def test_handlers_are_swapped_for_a_queue(self, queued_logger):
+        """Test that records reach the original handlers through the listener, at their levels"""
+        logger, handler = queued_logger
+
+        queue_logger_handlers(logger.name)
+
+        [queue_handler] = logger.handlers
+        assert isinstance(queue_handler, QueueHandler)
+
+        logger.warning("queued %s", 'warning')
+        logger.info("below the handler level")
+        listener = next(listener for pair_handler, listener in logging_utils._queued_handlers
+                        if pair_handler is queue_handler)
+        listener.stop()
+        listener.start()
+
+        assert handler.messages == ["queued warning"]
+
+    def test_queueing_twice_keeps_one_queue(self, queued_logger):
+        """Test that an already queued logger is left as it is"""
+        logger, _ = queued_logger
+        queue_logger_handlers(logger.name)
+        handlers = list(logger.handlers)
+
+        queue_logger_handlers(logger.name)
+
+        assert logger.handlers == handlers
+
+    def test_restart_gives_fresh_queues_and_listeners(self, queued_logger, monkeypatch):
+        """Test that forked children get a new queue over the same handlers"""
+        logger, handler = queued_logger
+        queue_logger_handlers(logger.name)
+        [queue_handler] = logger.handlers
+        pair = next(pair for pair in logging_utils._queued_handlers if pair[0] is queue_handler)
+        old_queue, old_listener = queue_handler.queue, pair[1]
+        # Restart only this logger's listener, as a forked child would
+        logging_utils._queued_handlers.remove(pair)
+        old_listener.stop()
+        pairs = [pair]
+        monkeypatch.setattr(logging_utils, '_queued_handlers', pairs)
+
+        logging_utils._restart_queue_listeners()
+
+        [(_, listener)] = pairs
+        assert isinstance(queue_handler.queue, queue.SimpleQueue)
+        assert queue_handler.queue is not old_queue
+        assert listener is not old_listener and listener.handlers == (handler,)
+
+        logger.error("after fork")
+        listener.stop()
+        pairs.clear()
+        assert handler.messages == ["after fork"]
@@ -0,0 +1,145 @@
+import asyncio
+import atexit
+import logging
+import time
+
+import orjson
+import pytest
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from utils.middleware import (
+    SLOW_REQUEST_THRESHOLD, RequestLoggingMiddleware, SlowRequestCounter, _MAX_LOGGED_BODY_BYTES
+)
+
+
+@pytest.fixture
+def middleware_logs(caplog):
+    """Capture the middleware's records; its 'utils' parent logger does not propagate to the root"""
+    logger = logging.getLogger('utils.middleware')
+    logger.addHandler(caplog.handler)
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+def make_middleware(get_response=lambda request: HttpResponse()):
+    """Build a RequestLoggingMiddleware without leaving its exit hook registered"""
+    middleware = RequestLoggingMiddleware(get_response)
+    atexit.unregister(middleware._report_slow_requests)
+    return middleware
+
+
+def json_post(data):
+    return RequestFactory().post('/api/transactions/', data=orjson.dumps(data), content_type='application/json')
+
+
+@pytest.mark.unit
+class TestSlowRequestCounter:
+    """Test the windowed slow request counts"""
+
+    def test_counts_are_held_until_the_window_elapses(self):
+        """Test that counts are only returned once the window has passed"""
+        counter = SlowRequestCounter(window=10)
+        start = time.perf_counter()
+        counter.add('GET', '/api/reports/')
+        counter.add('GET', '/api/reports/')
+
+        assert counter.pop_window(start + 5) is None
+
+        counts, elapsed = counter.pop_window(start + 11)
+        assert counts == {('GET', '/api/reports/'): 2}
+        assert elapsed == pytest.approx(11, abs=0.5)
+
+        # The window restarted and is empty
+        assert counter.pop_window(start + 30) is None
+
+    def test_force_returns_counts_and_actual_span_early(self):
+        """Test that a forced pop returns the counts and the shorter span they cover"""
+        counter = SlowRequestCounter(window=10)
+        start = time.perf_counter()
+        counter.add('POST', '/api/transactions/upload/')
+
+        counts, elapsed = counter.pop_window(start + 3, force=True)
+        assert counts == {('POST', '/api/transactions/upload/'): 1}
+        assert elapsed == pytest.approx(3, abs=0.5)
+        assert counter.pop_window(start + 4, force=True) is None
+
+
+@pytest.mark.unit
+class TestRequestLoggingMiddleware:
+    """Test request and response logging"""
+
+    @pytest.mark.parametrize('status_code, level', [
+        (200, logging.INFO),
+        (302, logging.INFO),
+        (404, logging.WARNING),
+        (503, logging.ERROR),
+    ])
+    def test_response_level_follows_status_class(self, middleware_logs, status_code, level):
+        """Test that responses log at INFO, 4xx at WARNING and 5xx at ERROR"""
+        make_middleware().process_response(RequestFactory().get('/api/reports/'), HttpResponse(status=status_code))
+
+        [record] = [record for record in middleware_logs.records if record.getMessage().startswith('Response')]
+        assert record.levelno == level
+        assert record.getMessage() == f"Response {status_code} for GET /api/reports/"
+
+    def test_async_get_response_is_awaited(self, middleware_logs):
+        """Test that an async stack gets a coroutine middleware that logs inline"""
+        async def get_response(request):
+            return HttpResponse(status=201)
+
+        middleware = make_middleware(get_response)
+        assert iscoroutinefunction(middleware)
+
+        response = asyncio.run(middleware(RequestFactory().get('/api/transactions/')))
+
+        assert response.status_code == 201
+        assert any(
+            record.getMessage().startswith("Response 201 for GET /api/transactions/ in ")
+            for record in middleware_logs.records
+        )
+
+    def test_slow_requests_are_flushed_at_exit(self, middleware_logs):
+        """Test that a forced report logs counts whose window never closed, with their real span"""
+        middleware = make_middleware()
+        middleware.slow_requests.add('GET', '/api/reports/')
+
+        middleware._report_slow_requests(force=True)
+
+        [record] = [record for record in middleware_logs.records if record.levelno == logging.WARNING]
+        assert record.getMessage().startswith(f"Slow requests (over {SLOW_REQUEST_THRESHOLD:.1f}s) in the last ")
+        assert record.getMessage().endswith("s: GET /api/reports/ x1")
+
+    def test_request_body_logged_only_at_debug(self, middleware_logs):
+        """Test that bodies are neither read nor logged unless DEBUG is enabled"""
+        request = json_post({'amount': '10.00'})
+        make_middleware().process_request(request)
+
+        assert not hasattr(request, '_body')
+        assert not any('Request body' in record.getMessage() for record in middleware_logs.records)
+
+        middleware_logs.set_level(logging.DEBUG, logger='utils.middleware')
+        make_middleware().process_request(json_post({'amount': '10.00'}))
+
+        assert 'Request body: {"amount":"10.00"}' in [record.getMessage() for record in middleware_logs.records]
+
+    def test_large_request_body_is_not_read(self, middleware_logs):
+        """Test that bodies over the size cap are skipped even at DEBUG"""
+        middleware_logs.set_level(logging.DEBUG, logger='utils.middleware')
+        request = json_post({'padding': 'x' * _MAX_LOGGED_BODY_BYTES})
+
+        make_middleware().process_request(request)
+
+        assert not hasattr(request, '_body')
+        assert not any('Request body' in record.getMessage() for record in middleware_logs.records)
+
+    def test_sanitized_request_body_is_a_copy(self, middleware_logs):
+        """Test that sensitive fields are redacted in the log without changing the parsed body"""
+        body = {'name': 'import', 'token': 'secret-token', 'password': 'hunter2'}
+
+        sanitized = make_middleware()._sanitize_request_body(body)
+
+        assert sanitized == {'name': 'import', 'token': '***REDACTED***', 'password': '***REDACTED***'}
+        assert body['token'] == 'secret-token'
+        assert make_middleware()._sanitize_request_body(['token']) == ['token']